@@ -1,15 +1,322 @@
-from typing import Any, Dict, List, Optional, Union, Type, TypeVar, Callable
-from sqlalchemy import func, and_, or_, desc, asc, select
-from sqlalchemy.sql import Select
+import hashlib
+import sys
+import time
+from collections.abc import Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Union, Type, TypeVar, Callable, Tuple
+from sqlalchemy import func, and_, or_, desc, asc, select, bindparam, literal, union_all, inspect
+from sqlalchemy.sql import Select, visitors
+from sqlalchemy.sql.elements import BindParameter
 from sqlalchemy.sql.expression import Function
 
 from .interfaces import BuilderInterface
+from .conditions import build_condition, bind_value
 from ..types import ModelType, FilterValue, FilterOperator
 from ..filters import Filter, FilterGroup, FilterCondition, Operator
+from ..filters.operators import operator_value
 from ..exceptions import InvalidQueryException
 
 T = TypeVar('T', bound=ModelType)
 
+
+# Types d'agrégats : index dans la table de dispatch _AGG_FUNCS
+COLUMN, COUNT, SUM, AVG, MIN, MAX = range(6)
+
+
+class Aggregate(NamedTuple):
+    """Agrégat en attente : type (COLUMN, COUNT...), colonne source et alias du résultat."""
+    type: int
+    column: str
+    alias: str
+
+
+class Having(NamedTuple):
+    """Condition HAVING en attente."""
+    column: str
+    operator: str
+    value: Any
+
+
+class AggregateFuture(Mapping):
+    """
+    Résultat différé d'un get() appelé dans AggregateBuilder.scoped_batch().
+    
+    Se comporte comme le dict retourné par get() une fois le bloc terminé.
+    """
+    
+    def __init__(self):
+        self._result: Optional[Dict[str, Any]] = None
+        self._resolved = False
+        
+    def _resolve(self, result: Optional[Dict[str, Any]]) -> None:
+        self._result = result
+        self._resolved = True
+        
+    def result(self) -> Optional[Dict[str, Any]]:
+        """Retourne le résultat (None si aucune ligne ne correspond)."""
+        if not self._resolved:
+            raise InvalidQueryException("Aggregate result not available before the end of scoped_batch()")
+        return self._result
+        
+    def __getitem__(self, key: str) -> Any:
+        return (self.result() or {})[key]
+        
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.result() or {})
+        
+    def __len__(self) -> int:
+        return len(self.result() or {})
+
+
+@dataclass(frozen=True, slots=True)
+class AggregatePlan:
+    """
+    Requête d'agrégation figée par AggregateBuilder.freeze().
+    
+    Le Select est déjà construit : get() l'exécute directement, sans repasser
+    par le builder. Les valeurs liées peuvent être remplacées à l'exécution
+    en utilisant le nom des bindparams (w0, w1... pour WHERE, h0... pour
+    HAVING, limit, offset).
+    
+    Example:
+        plan = Order.aggregate()\
+            .where('status', 'paid')\
+            .sum('amount', 'total')\
+            .freeze()
+            
+        plan.get()              # statut 'paid'
+        plan.get(w0='refunded') # même requête, autre valeur
+    """
+    model: Type[ModelType]
+    statement: Select
+    extract: Callable[[Any], Dict[str, Any]]
+    params: Mapping[str, Any]
+    
+    def __post_init__(self) -> None:
+        # Copie en lecture seule : le plan figé ne partage pas le dict fourni
+        object.__setattr__(self, 'params', MappingProxyType(dict(self.params)))
+        
+    def get(self, **values: Any) -> Optional[Dict[str, Any]]:
+        """Exécute la requête figée et retourne la première ligne (None si aucune)."""
+        session = self.model.get_session()
+        row = session.execute(self.statement, {**self.params, **values}).first()
+        return None if row is None else self.extract(row)
+
+
+class MemoryCache:
+    """
+    Cache de résultats en mémoire avec expiration (TTL).
+    
+    Expose la même API que les caches Django (`get`/`set(key, value, timeout)`),
+    ce qui permet de le remplacer par un cache partagé (Redis, memcached...).
+    
+    Le nombre d'entrées est borné par `maxsize` : une fois plein, set() purge
+    les entrées expirées puis, si besoin, les plus anciennes.
+    """
+    
+    def __init__(self, maxsize: int = 1024):
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        self.maxsize = maxsize
+        
+    def get(self, key: str, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return default
+        return value
+        
+    def set(self, key: str, value: Any, timeout: int = 60) -> None:
+        entries = self._entries
+        now = time.monotonic()
+        entries.pop(key, None)
+        if len(entries) >= self.maxsize:
+            for expired in [k for k, (expires_at, _) in entries.items() if expires_at < now]:
+                del entries[expired]
+            # Libère au moins un quart du cache pour ne pas purger à chaque set()
+            keep = self.maxsize * 3 // 4
+            for oldest in list(entries)[:max(len(entries) - keep, 0)]:
+                del entries[oldest]
+        entries[key] = (now + timeout, value)
+
+
+# Builders en attente dans le scoped_batch() courant (None hors d'un batch)
+_pending_batch: ContextVar[Optional[List[Tuple['AggregateBuilder', AggregateFuture]]]] = ContextVar(
+    '_pending_batch', default=None
+)
+
+
+@lru_cache(maxsize=4096)
+def _make_aggregate(type_: int, column: str, alias: str) -> Aggregate:
+    """Flyweight : les recettes d'agrégats identiques partagent le même tuple."""
+    return Aggregate(type_, column, alias)
+
+
+_DIRECTIONS = frozenset(('asc', 'desc'))
+
+# Normalisation des opérateurs : membre de l'enum, valeur ou valeur en minuscules
+_OPERATORS: Dict[Any, str] = {op.value: op.value for op in Operator}
+_OPERATORS.update({op.value.lower(): op.value for op in Operator})
+_OPERATORS.update({op: op.value for op in Operator})
+
+# Table de dispatch indexée par type d'agrégat (COLUMN sélectionne la colonne telle quelle)
+_AGG_FUNCS: Tuple[Callable[[Any], Any], ...] = (
+    lambda column: column,
+    func.count,
+    func.sum,
+    func.avg,
+    func.min,
+    func.max,
+)
+
+
+@lru_cache(maxsize=256)
+def _column(model: Type[ModelType], name: str) -> Any:
+    """
+    Résout (et mémorise) la colonne `name` du modèle.
+    
+    Retourne la Column Core de la table mappée plutôt que l'attribut ORM
+    instrumenté, pour que le Select reste une requête Core pure.
+    """
+    columns = inspect(model).columns
+    if name in columns:
+        return columns[name]
+    return getattr(model, name)
+
+
+@lru_cache(maxsize=256)
+def _order_expression(model: Type[ModelType], column: str, direction: str, is_alias: bool) -> Any:
+    """
+    Résout (et mémorise) l'expression ORDER BY d'une colonne ou d'un alias.
+    
+    Un alias d'agrégat est référencé par son nom : SQLAlchemy le résout vers
+    le label correspondant du Select à la compilation.
+    """
+    target = column if is_alias else _column(model, column)
+    return desc(target) if direction == 'desc' else asc(target)
+
+
+@lru_cache(maxsize=256)
+def _extractor(aliases: Tuple[str, ...]) -> Callable[[Any], Dict[str, Any]]:
+    """
+    Génère (une fois par forme) la fonction qui convertit une ligne en dict.
+    
+    Les colonnes du Select compilé suivent l'ordre des alias : la fonction
+    générée indexe directement la ligne, sans boucle ni lookup par nom.
+    """
+    items = ', '.join(f"{alias!r}: row[{i}]" for i, alias in enumerate(aliases))
+    namespace: Dict[str, Any] = {}
+    exec(f"def extract(row):\n    return {{{items}}}\n", namespace)
+    return namespace['extract']
+
+
+@lru_cache(maxsize=256)
+def _compile(model: Type[ModelType], shape: Tuple, key: Optional[int] = None) -> Select:
+    """
+    Compile le Select correspondant à une forme de requête d'agrégation.
+    
+    Les valeurs littérales (WHERE, HAVING, LIMIT, OFFSET) sont remplacées par
+    des bindparams : deux builders de même forme partagent le même Select.
+    
+    Avec `key` (index d'une condition d'égalité, utilisé par batch()), la
+    condition devient un IN et la requête est groupée sur sa colonne,
+    sélectionnée en dernière position.
+    """
+    aggregates, groups, filters, havings, orders, has_limit, has_offset = shape
+    labels = {}
+    
+    # Ajoute les agrégats
+    for type_, column_name, alias in aggregates:
+        expr = _AGG_FUNCS[type_](_column(model, column_name))
+        labels[alias] = expr.label(alias)
+        
+    # Requête Core : seuls les agrégats sont sélectionnés, aucune entité ORM
+    query = select(*labels.values()).select_from(model.__table__)
+    
+    if key is not None:
+        key_column = _column(model, filters[key][0])
+        query = query.add_columns(key_column).group_by(key_column)
+        
+    # Ajoute les groupements
+    if groups:
+        query = query.group_by(*[_column(model, column) for column in groups])
+        
+    # Ajoute les conditions WHERE en un seul appel
+    if filters:
+        query = query.where(and_(*[
+            build_condition(
+                _column(model, field),
+                Operator.IN.value if i == key else operator,
+                f"w{i}"
+            )
+            for i, (field, operator) in enumerate(filters)
+        ]))
+        
+    # Ajoute les conditions HAVING (sur un alias d'agrégat ou une colonne)
+    if havings:
+        query = query.having(and_(*[
+            build_condition(
+                labels[column].element if column in labels else _column(model, column),
+                operator,
+                f"h{i}"
+            )
+            for i, (column, operator) in enumerate(havings)
+        ]))
+        
+    # Ajoute les conditions ORDER BY (expressions mémorisées par _order_expression)
+    if orders:
+        query = query.order_by(*[_order_expression(model, *order) for order in orders])
+        
+    # Ajoute les limites et les offsets (testés sur `is not None` dans la clé
+    # de forme : LIMIT 0 / OFFSET 0 restent des clauses valides)
+    if has_limit and has_offset:
+        return query.limit(bindparam('limit')).offset(bindparam('offset'))
+    if has_limit:
+        return query.limit(bindparam('limit'))
+    if has_offset:
+        return query.offset(bindparam('offset'))
+        
+    return query
+
+
+def _batch_key(model: Type[ModelType], shape: Tuple, params: List[Dict[str, Any]]) -> Optional[int]:
+    """
+    Index de la condition d'égalité sur laquelle regrouper des builders de
+    même forme, ou None s'ils ne diffèrent pas que par la valeur de celle-ci.
+    
+    Seules les agrégations simples (ni colonnes brutes, groupements, HAVING,
+    ORDER BY ni LIMIT/OFFSET) sont regroupables, et les valeurs doivent être
+    du type Python de la colonne pour retrouver chaque résultat par sa clé.
+    """
+    aggregates, groups, filters, havings, orders, has_limit, has_offset = shape
+    if groups or havings or orders or has_limit or has_offset:
+        return None
+    if any(agg.type == COLUMN for agg in aggregates):
+        return None
+        
+    first = params[0]
+    varying = [name for name in first if any(p[name] != first[name] for p in params[1:])]
+    if len(varying) != 1:
+        return None
+        
+    for i, (field, operator) in enumerate(filters):
+        if varying[0] == f"w{i}" and operator == Operator.EQUAL.value:
+            try:
+                python_type = _column(model, field).type.python_type
+            except (AttributeError, NotImplementedError):
+                return None
+            if all(type(p[varying[0]]) is python_type for p in params):
+                return i
+            return None
+    return None
+
+
 class AggregateBuilder(BuilderInterface):
     """
     Builder spécialisé pour les opérations d'agrégation complexes.
@@ -43,13 +350,23 @@ class AggregateBuilder(BuilderInterface):
             .get()
     """
     
+    __slots__ = (
+        'model', '_aggregates', '_groups', '_filters',
+        '_havings', '_orders', '_limit', '_offset'
+    )
+    
+    # Cache utilisé par get(cache=...) ; remplaçable par un cache partagé
+    cache_store: Any = MemoryCache()
+    cache_timeout: int = 60
+    
     def __init__(self, model: Type[ModelType]):
         super().__init__(model)
-        self._aggregates: List[Dict[str, Any]] = []
+        self._aggregates: List[Aggregate] = []
         self._groups: List[str] = []
         self._filters: List[FilterCondition] = []
-        self._havings: List[Dict[str, Any]] = []
-        self._orders: List[Dict[str, str]] = []
+        self._havings: List[Having] = []
+        # (colonne ou alias, direction, est un alias) : résolus par _compile()
+        self._orders: List[Tuple[str, str, bool]] = []
         self._limit: Optional[int] = None
         self._offset: Optional[int] = None
         
@@ -62,11 +379,7 @@ class AggregateBuilder(BuilderInterface):
                 .count('id', 'total')
         """
         for column in columns:
-            self._aggregates.append({
-                'type': 'column',
-                'column': column,
-                'alias': column
-            })
+            self._aggregates.append(_make_aggregate(COLUMN, column, column))
         return self
         
     def count(self, column: str, alias: Optional[str] = None) -> 'AggregateBuilder':
@@ -76,11 +389,7 @@ class AggregateBuilder(BuilderInterface):
         Example:
             query.count('id', 'total_users')
         """
-        self._aggregates.append({
-            'type': 'count',
-            'column': column,
-            'alias': alias or f"count_{column}"
-        })
+        self._aggregates.append(_make_aggregate(COUNT, column, alias or f"count_{column}"))
         return self
         
     def sum(self, column: str, alias: Optional[str] = None) -> 'AggregateBuilder':
@@ -90,11 +399,7 @@ class AggregateBuilder(BuilderInterface):
         Example:
             query.sum('amount', 'total_amount')
         """
-        self._aggregates.append({
-            'type': 'sum',
-            'column': column,
-            'alias': alias or f"sum_{column}"
-        })
+        self._aggregates.append(_make_aggregate(SUM, column, alias or f"sum_{column}"))
         return self
         
     def avg(self, column: str, alias: Optional[str] = None) -> 'AggregateBuilder':
@@ -104,11 +409,7 @@ class AggregateBuilder(BuilderInterface):
         Example:
             query.avg('rating', 'average_rating')
         """
-        self._aggregates.append({
-            'type': 'avg',
-            'column': column,
-            'alias': alias or f"avg_{column}"
-        })
+        self._aggregates.append(_make_aggregate(AVG, column, alias or f"avg_{column}"))
         return self
         
     def min(self, column: str, alias: Optional[str] = None) -> 'AggregateBuilder':
@@ -118,11 +419,7 @@ class AggregateBuilder(BuilderInterface):
         Example:
             query.min('price', 'lowest_price')
         """
-        self._aggregates.append({
-            'type': 'min',
-            'column': column,
-            'alias': alias or f"min_{column}"
-        })
+        self._aggregates.append(_make_aggregate(MIN, column, alias or f"min_{column}"))
         return self
         
     def max(self, column: str, alias: Optional[str] = None) -> 'AggregateBuilder':
@@ -132,11 +429,7 @@ class AggregateBuilder(BuilderInterface):
         Example:
             query.max('views', 'most_views')
         """
-        self._aggregates.append({
-            'type': 'max',
-            'column': column,
-            'alias': alias or f"max_{column}"
-        })
+        self._aggregates.append(_make_aggregate(MAX, column, alias or f"max_{column}"))
         return self
         
     def group_by(self, *columns: str) -> 'AggregateBuilder':
@@ -149,6 +442,44 @@ class AggregateBuilder(BuilderInterface):
         self._groups.extend(columns)
         return self
         
+    def where(
+        self,
+        column: str,
+        operator: Union[str, Operator] = Operator.EQUAL.value,
+        value: Any = None
+    ) -> 'AggregateBuilder':
+        """
+        Ajoute une condition WHERE.
+        
+        Example:
+            query.where('status', '=', 'paid')
+        """
+        operator = operator_value(operator)
+        self._filters.append(FilterCondition(column, operator, value))
+        return self
+        
+    def when(
+        self,
+        condition: bool,
+        true_callback: Callable[['AggregateBuilder'], None],
+        false_callback: Optional[Callable[['AggregateBuilder'], None]] = None
+    ) -> 'AggregateBuilder':
+        """
+        Applique conditionnellement des modifications à la requête.
+        
+        Example:
+            query.when(
+                include_inactive,
+                lambda q: q.where('status', '=', 'inactive')
+            )
+        """
+        if condition:
+            true_callback(self)
+        elif false_callback:
+            false_callback(self)
+            
+        return self
+        
     def having(
         self,
         column: str,
@@ -161,14 +492,11 @@ class AggregateBuilder(BuilderInterface):
         Example:
             query.having('count_id', '>', 10)
         """
-        if isinstance(operator, Operator):
-            operator = operator.value
+        normalized = _OPERATORS.get(operator)
+        if normalized is None:
+            raise InvalidQueryException(f"Opérateur invalide: {operator}")
             
-        self._havings.append({
-            'column': column,
-            'operator': operator,
-            'value': value
-        })
+        self._havings.append(Having(column, normalized, value))
         return self
         
     def order_by(self, column: str, direction: str = 'asc') -> 'AggregateBuilder':
@@ -179,85 +507,341 @@ class AggregateBuilder(BuilderInterface):
             query.order_by('total_amount', 'desc')
         """
         direction = direction.lower()
-        if direction not in ('asc', 'desc'):
+        if direction not in _DIRECTIONS:
             raise InvalidQueryException(f"Direction invalide: {direction}")
             
-        self._orders.append({
-            'column': column,
-            'direction': direction
-        })
+        is_alias = any(agg.alias == column for agg in self._aggregates) \
+            or not hasattr(self.model, column)
+        self._orders.append((column, sys.intern(direction), is_alias))
+        return self
+        
+    def take(self, limit: int) -> 'AggregateBuilder':
+        """
+        Limite le nombre de lignes retournées (LIMIT 0 est conservé).
+        
+        Example:
+            query.group_by('status').take(5)
+        """
+        if limit < 0:
+            raise InvalidQueryException("La limite doit être positive")
+        self._limit = limit
+        return self
+        
+    def skip(self, offset: int) -> 'AggregateBuilder':
+        """
+        Ignore un nombre de lignes (OFFSET 0 est conservé).
+        
+        Example:
+            query.group_by('status').skip(10)
+        """
+        if offset < 0:
+            raise InvalidQueryException("L'offset doit être positif")
+        self._offset = offset
         return self
 
-    def get(self) -> Dict[str, Any]:
+    def get(self, *, cache: Optional[Union[bool, int]] = None) -> Optional[Dict[str, Any]]:
         """
         Exécute la requête d'agrégation et retourne les résultats.
         
+        Args:
+            cache: Met le résultat en cache (True : 60 secondes, int : durée
+                en secondes). Utile pour les totaux de pagination coûteux.
+                
+        Example:
+            total = Order.aggregate().count('id', 'total').get(cache=300)
+            
         Raises:
             InvalidQueryException: Si la requête est invalide
             
         Returns:
-            Dict[str, Any]: Résultats des agrégations
+            Optional[Dict[str, Any]]: Résultats des agrégations, None si
+            aucune ligne ne correspond (WHERE + GROUP BY, HAVING...) ; un
+            AggregateFuture lorsque appelé dans scoped_batch()
         """
         if not self._aggregates:
             raise InvalidQueryException("No aggregates defined")
             
-        query = self._build_query()
-        result = query.first()
+        # Dans un scoped_batch(), la requête est différée jusqu'à la fin du bloc
+        pending = _pending_batch.get()
+        if pending is not None:
+            self._check_batchable()
+            future = AggregateFuture()
+            pending.append((self, future))
+            return future
+            
+        params = self._build_params()
         
-        return {
-            agg['alias']: getattr(result, agg['alias'])
-            for agg in self._aggregates
-        }
-    
-    def _build_query(self):
-        """Construit la requête SQL finale"""
-        query = self._query
-        
-        # Ajoute les agrégats
-        for agg in self._aggregates:
-            column = getattr(self._query.model, agg['column'])
-            match agg['type']:
-                case 'count':
-                    expr = func.count(column)
-                case 'sum':
-                    expr = func.sum(column)
-                case 'avg':
-                    expr = func.avg(column)
-                case 'min':
-                    expr = func.min(column)
-                case 'max':
-                    expr = func.max(column)
-                case _:
-                    raise InvalidQueryException(f"Invalid aggregate type: {agg['type']}")
-                    
-            query = query.add_columns(expr.label(agg['alias']))
+        key = None
+        if cache:
+            key = self._cache_key(params)
+            cached = self.cache_store.get(key)
+            if cached is not None:
+                # Copie : un appelant qui modifie son résultat n'altère pas le cache
+                return dict(cached)
+                
+        session = self.model.get_session()
+        row = session.execute(self._build_query(), params).first()
+        if row is None:
+            return None
+        result = _extractor(self._aliases())(row)
+        
+        if key is not None:
+            timeout = cache if cache is not True else self.cache_timeout
+            self.cache_store.set(key, dict(result), timeout=timeout)
             
-        # Ajoute les groupements
-        if self._groups:
-            query = query.group_by(*self._groups)
+        return result
+        
+    def first(self) -> Optional[Dict[str, Any]]:
+        """Alias de get() : une requête d'agrégation retourne une seule ligne."""
+        return self.get()
+        
+    def stream(self, chunk_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Itère sur toutes les lignes d'une agrégation groupée.
+        
+        Contrairement à get() qui ne retourne que la première ligne, stream()
+        produit un dict par groupe. Les lignes sont récupérées par paquets de
+        `chunk_size` (curseur côté serveur lorsque le driver le permet).
+        
+        Example:
+            for stats in Order.aggregate()\
+                    .select('status')\
+                    .sum('amount', 'total')\
+                    .group_by('status')\
+                    .stream():
+                print(stats['status'], stats['total'])
+        """
+        if not self._aggregates:
+            raise InvalidQueryException("No aggregates defined")
             
-        # Ajoute les conditions HAVING
-        for having in self._havings:
-            query = query.having(
-                self._build_having_condition(having)
-            )
+        extract = _extractor(self._aliases())
+        session = self.model.get_session()
+        result = session.execute(
+            self._build_query(),
+            self._build_params(),
+            execution_options={'stream_results': True, 'yield_per': chunk_size}
+        )
+        for row in result:
+            yield extract(row)
+        
+    def _cache_key(self, params: Dict[str, Any]) -> str:
+        """
+        Clé de cache dérivée du modèle, de la forme de la requête et des
+        valeurs liées : la forme détermine le Select, sans avoir à le compiler.
+        """
+        model = f"{self.model.__module__}.{self.model.__qualname__}"
+        digest = hashlib.blake2b(repr((model, self._shape_key(), params)).encode(), digest_size=16)
+        return f"pyloquent:aggregate:{digest.hexdigest()}"
+        
+    def freeze(self) -> AggregatePlan:
+        """
+        Fige la requête courante dans un AggregatePlan immuable et réutilisable.
+        
+        Example:
+            plan = Order.aggregate().count('id', 'total').freeze()
+            plan.get()
+        """
+        if not self._aggregates:
+            raise InvalidQueryException("No aggregates defined")
             
-        # Ajoute les conditions WHERE
-        for filter in self._filters:
-            query = query.where(
-                self._build_filter_condition(filter)
-            )
+        return AggregatePlan(
+            model=self.model,
+            statement=self._build_query(),
+            extract=_extractor(self._aliases()),
+            params=self._build_params()
+        )
+        
+    @classmethod
+    @contextmanager
+    def scoped_batch(cls) -> Iterator[None]:
+        """
+        Regroupe les get() exécutés dans le bloc en une seule requête.
+        
+        Chaque get() retourne un AggregateFuture ; toutes les requêtes sont
+        envoyées via batch() à la sortie du bloc (rien n'est exécuté si le
+        bloc lève une exception).
+        
+        Example:
+            with AggregateBuilder.scoped_batch():
+                stats = {
+                    user.id: Order.aggregate()
+                        .where('user_id', user.id)
+                        .count('id', 'orders')
+                        .get()
+                    for user in users
+                }
+            # Une seule requête a été exécutée
+            stats[user.id]['orders']
+        """
+        pending: List[Tuple[AggregateBuilder, AggregateFuture]] = []
+        token = _pending_batch.set(pending)
+        try:
+            yield
+        finally:
+            _pending_batch.reset(token)
+            
+        if pending:
+            results = cls.batch([builder for builder, _ in pending])
+            for (_, future), result in zip(pending, results):
+                future._resolve(result)
+        
+    @classmethod
+    def batch(cls, builders: List['AggregateBuilder']) -> List[Dict[str, Any]]:
+        """
+        Exécute plusieurs requêtes d'agrégation en un minimum d'allers-retours.
+        
+        Chaque builder ne produit qu'une ligne : les agrégations groupées ou
+        triées (group_by(), order_by()) sont refusées, utiliser stream().
+        
+        Les builders de même forme qui ne diffèrent que par la valeur d'une
+        condition d'égalité sont regroupés en une seule requête
+        `GROUP BY colonne` avec `colonne IN (...)`. Les autres sont envoyés
+        ensemble via UNION ALL (les alias absents d'une requête sont complétés
+        par NULL).
+        
+        Example:
+            orders, users = AggregateBuilder.batch([
+                Order.aggregate().count('id', 'total_orders'),
+                User.aggregate().count('id', 'total_users')
+            ])
+            
+        Returns:
+            List[Dict[str, Any]]: Résultats, dans l'ordre des builders
+        """
+        if not builders:
+            return []
+            
+        shapes: Dict[Tuple, List[int]] = {}
+        for i, builder in enumerate(builders):
+            builder._check_batchable()
+            shapes.setdefault((builder.model, builder._shape_key()), []).append(i)
             
-        # Ajoute les conditions ORDER BY
-        for order in self._orders:
-            query = query.order_by(
-                getattr(getattr(self._query.model, order['column']), order['direction'])
+        results: List[Optional[Dict[str, Any]]] = [None] * len(builders)
+        remaining: List[int] = []
+        
+        for (model, shape), indices in shapes.items():
+            group = [builders[i] for i in indices]
+            params = [builder._build_params() for builder in group]
+            key = _batch_key(model, shape, params) if len(group) > 1 else None
+            if key is None:
+                remaining.extend(indices)
+                continue
+            for i, result in zip(indices, cls._batch_by_key(model, shape, key, params)):
+                results[i] = result
+                
+        if remaining:
+            for i, result in zip(remaining, cls._batch_union([builders[i] for i in remaining])):
+                results[i] = result
+                
+        return results
+        
+    @staticmethod
+    def _batch_by_key(
+        model: Type[ModelType],
+        shape: Tuple,
+        key: int,
+        params: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Exécute des builders de même forme en une requête groupée sur la
+        colonne de la condition `key` (voir _batch_key()).
+        """
+        name = f"w{key}"
+        aliases = tuple(dict.fromkeys(agg.alias for agg in shape[0]))
+        extract = _extractor(aliases)
+        
+        session = model.get_session()
+        rows = session.execute(
+            _compile(model, shape, key),
+            {**params[0], name: list(dict.fromkeys(p[name] for p in params))}
+        ).all()
+        by_key = {row[-1]: extract(row) for row in rows}
+        
+        # Valeur sans ligne : résultat d'une agrégation sur un ensemble vide
+        empty = {agg.alias: 0 if agg.type == COUNT else None for agg in shape[0]}
+        return [dict(by_key.get(p[name], empty)) for p in params]
+        
+    @staticmethod
+    def _batch_union(builders: List['AggregateBuilder']) -> List[Optional[Dict[str, Any]]]:
+        """Exécute des builders de formes différentes en une requête UNION ALL."""
+        aliases = list(dict.fromkeys(
+            agg.alias for builder in builders for agg in builder._aggregates
+        ))
+        selects = []
+        params: Dict[str, Any] = {}
+        
+        for i, builder in enumerate(builders):
+            # Préfixe les bindparams pour éviter les collisions entre requêtes
+            prefix = f"b{i}_"
+            query = visitors.replacement_traverse(
+                builder._build_query(),
+                {},
+                lambda element, prefix=prefix: bindparam(
+                    prefix + element.key,
+                    type_=element.type,
+                    expanding=element.expanding
+                ) if isinstance(element, BindParameter) else None
             )
+            params.update({prefix + key: value for key, value in builder._build_params().items()})
             
-        # Ajoute les limites et les offsets
-        if self._limit:
-            query = query.limit(self._limit)
-        if self._offset:
-            query = query.offset(self._offset)
+            subquery = query.subquery()
+            own_aliases = {agg.alias for agg in builder._aggregates}
+            selects.append(select(
+                literal(i).label('_batch'),
+                *[
+                    subquery.c[alias] if alias in own_aliases else literal(None).label(alias)
+                    for alias in aliases
+                ]
+            ))
             
-        return query 
\ No newline at end of file
+        session = builders[0].model.get_session()
+        rows = session.execute(union_all(*selects), params).all()
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(builders)
+        for row in rows:
+            row = row._mapping
+            i = row['_batch']
+            if results[i] is None:
+                results[i] = {agg.alias: row[agg.alias] for agg in builders[i]._aggregates}
+                
+        return results
+        
+    def _check_batchable(self) -> None:
+        """Vérifie que la requête peut être regroupée par batch()."""
+        if not self._aggregates:
+            raise InvalidQueryException("No aggregates defined")
+        if self._groups or self._orders:
+            raise InvalidQueryException("Grouped or ordered aggregates cannot be batched")
+            
+    def _aliases(self) -> Tuple[str, ...]:
+        """Alias des agrégats, dans l'ordre des colonnes du Select compilé."""
+        return tuple(dict.fromkeys(agg.alias for agg in self._aggregates))
+        
+    def _shape_key(self) -> Tuple:
+        """Forme structurelle de la requête, sans les valeurs littérales."""
+        return (
+            tuple(self._aggregates),
+            tuple(self._groups),
+            tuple((f.field, f.operator) for f in self._filters),
+            tuple((h.column, h.operator) for h in self._havings),
+            tuple(self._orders),
+            self._limit is not None,
+            self._offset is not None
+        )
+        
+    def _build_params(self) -> Dict[str, Any]:
+        """Valeurs à lier aux bindparams du Select compilé."""
+        params: Dict[str, Any] = {}
+        for i, condition in enumerate(self._filters):
+            bind_value(params, f"w{i}", condition.operator, condition.value)
+        for i, having in enumerate(self._havings):
+            bind_value(params, f"h{i}", having.operator, having.value)
+        if self._limit is not None:
+            params['limit'] = self._limit
+        if self._offset is not None:
+            params['offset'] = self._offset
+        return params
+    
+    def _build_query(self) -> Select:
+        """Retourne le Select compilé (mis en cache) pour la forme courante."""
+        return _compile(self.model, self._shape_key())
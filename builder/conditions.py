@@ -0,0 +1,79 @@
+"""
+Construction des conditions SQL paramétrées partagée par les builders.
+
+Les valeurs ne sont jamais intégrées au Select : chaque condition référence
+un bindparam nommé, ce qui permet de mettre en cache un Select par forme de
+requête et de fournir les valeurs à l'exécution.
+"""
+
+from typing import Any, Callable, Dict, Sequence, Tuple
+
+from sqlalchemy import bindparam
+
+from ..filters import Operator
+
+NULL_OPERATORS = (Operator.NULL.value, Operator.NOT_NULL.value)
+BETWEEN_OPERATORS = (Operator.BETWEEN.value, Operator.NOT_BETWEEN.value)
+
+
+# Table de dispatch opérateur -> constructeur de condition (column, key)
+CONDITION_BUILDERS: Dict[str, Callable[[Any, str], Any]] = {
+    Operator.NULL.value: lambda column, key: column.is_(None),
+    Operator.NOT_NULL.value: lambda column, key: column.isnot(None),
+    Operator.IN.value: lambda column, key: column.in_(bindparam(key, expanding=True)),
+    Operator.NOT_IN.value: lambda column, key: ~column.in_(bindparam(key, expanding=True)),
+    Operator.BETWEEN.value: lambda column, key: column.between(
+        bindparam(f"{key}_0"), bindparam(f"{key}_1")
+    ),
+    Operator.NOT_BETWEEN.value: lambda column, key: ~column.between(
+        bindparam(f"{key}_0"), bindparam(f"{key}_1")
+    ),
+    Operator.LIKE.value: lambda column, key: column.like(bindparam(key)),
+    Operator.ILIKE.value: lambda column, key: column.ilike(bindparam(key)),
+}
+
+
+# Rang de sélectivité estimée par opérateur (0 = le plus sélectif) : les
+# conditions d'égalité sont émises avant les plages, puis les LIKE
+SELECTIVITY: Dict[str, int] = {
+    Operator.EQUAL.value: 0,
+    Operator.IN.value: 1,
+    Operator.NULL.value: 1,
+    Operator.BETWEEN.value: 2,
+    Operator.GREATER_THAN.value: 3,
+    Operator.GREATER_THAN_OR_EQUAL.value: 3,
+    Operator.LESS_THAN.value: 3,
+    Operator.LESS_THAN_OR_EQUAL.value: 3,
+    Operator.NOT_EQUAL.value: 4,
+    Operator.NOT_IN.value: 4,
+    Operator.NOT_BETWEEN.value: 4,
+    Operator.LIKE.value: 5,
+    Operator.ILIKE.value: 6,
+    Operator.NOT_NULL.value: 7,
+}
+
+
+def selectivity_order(operators: Sequence[str]) -> Tuple[int, ...]:
+    """
+    Indices des conditions triées par sélectivité estimée (tri stable).
+    L'ordre d'origine est conservé si un opérateur est inconnu.
+    """
+    if not all(operator in SELECTIVITY for operator in operators):
+        return tuple(range(len(operators)))
+    return tuple(sorted(range(len(operators)), key=lambda i: SELECTIVITY[operators[i]]))
+
+
+def build_condition(column: Any, operator: str, key: str) -> Any:
+    """Construit une condition SQL dont la valeur est un bindparam nommé `key`."""
+    builder = CONDITION_BUILDERS.get(operator)
+    if builder is not None:
+        return builder(column, key)
+    return column.op(operator)(bindparam(key))
+
+
+def bind_value(params: Dict[str, Any], key: str, operator: str, value: Any) -> None:
+    """Associe la valeur d'une condition aux bindparams créés par `build_condition`."""
+    if operator in BETWEEN_OPERATORS:
+        params[f"{key}_0"], params[f"{key}_1"] = value
+    elif operator not in NULL_OPERATORS:
+        params[key] = value
@@ -6,6 +6,9 @@ from ..types import ModelType
 class BuilderInterface(ABC):
     """Interface de base pour tous les builders"""
     
+    # Permet aux builders qui le souhaitent de déclarer leurs propres __slots__
+    __slots__ = ()
+    
     @abstractmethod
     def __init__(self, model: Type[ModelType]):
         self.model = model
@@ -1,18 +1,262 @@
-from typing import Any, List, Dict, Optional, TypeVar, Union, Type, Callable
-from sqlalchemy import select, func, and_, or_, desc, asc
+import copy
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, List, Dict, Optional, Tuple, TypeVar, Union, Type, Callable, Iterator
+from sqlalchemy import select, func, and_, or_, desc, asc, bindparam, literal, inspect
+from sqlalchemy import update as sa_update, delete as sa_delete
 from sqlalchemy.sql import Select
-from sqlalchemy.orm import Query, joinedload
+from sqlalchemy.orm import Query, RelationshipProperty, joinedload, selectinload
 
 from .interfaces import BuilderInterface
+from .conditions import build_condition, bind_value, selectivity_order
 from ..types import ModelType, FilterValue, FilterOperator
 from ..exceptions.pyloquent_exception import ModelNotFoundException
 from ..filters import Filter, FilterGroup, FilterCondition, Operator
+from ..filters.operators import operator_value
 from ..pagination import Paginator, LengthAwarePaginator, CursorPaginator
 
 from libs.pyloquent.exceptions import InvalidQueryException
 
 T = TypeVar('T', bound=ModelType)
 
+# Operator values, bound once instead of reading Operator.X.value per call
+(
+    _OP_EQ, _OP_GT, _OP_GTE, _OP_LT, _OP_LTE, _OP_IN, _OP_NOT_IN, _OP_NULL,
+    _OP_NOT_NULL, _OP_BETWEEN, _OP_NOT_BETWEEN, _OP_LIKE, _OP_ILIKE
+) = (
+    op.value for op in (
+        Operator.EQUAL, Operator.GREATER_THAN, Operator.GREATER_THAN_OR_EQUAL,
+        Operator.LESS_THAN, Operator.LESS_THAN_OR_EQUAL, Operator.IN,
+        Operator.NOT_IN, Operator.NULL, Operator.NOT_NULL, Operator.BETWEEN,
+        Operator.NOT_BETWEEN, Operator.LIKE, Operator.ILIKE
+    )
+)
+
+# Accepted ORDER BY directions, and the matching SQLAlchemy modifiers
+_DIRECTIONS: Dict[str, str] = {'asc': 'asc', 'desc': 'desc', 'ASC': 'asc', 'DESC': 'desc'}
+_ORDER_FUNCTIONS: Dict[str, Callable] = {'asc': asc, 'desc': desc}
+
+
+@lru_cache(maxsize=1024)
+def _column(model: Type[ModelType], name: str) -> Any:
+    """Resolve (and memoize) the column attribute `name` of a model."""
+    return getattr(model, name)
+
+
+@lru_cache(maxsize=256)
+def _primary_key(model: Type[ModelType]) -> str:
+    """Attribute name of the (first) primary key column of a model."""
+    mapper = inspect(model)
+    return mapper.get_property_by_column(mapper.primary_key[0]).key
+
+
+@lru_cache(maxsize=1024)
+def _base_select(model: Type[ModelType], columns: Tuple[str, ...] = ()) -> Select:
+    """
+    Return the shared base Select of a model (or of some of its columns).
+    
+    Selects hash by identity: sharing the base lets `_compile` hit its cache
+    across builders instead of once per builder.
+    """
+    if columns:
+        return select(*[_column(model, col) for col in columns])
+    return select(model)
+
+
+def _range_pairs(filter_cols: Tuple[str, ...], filter_ops: Tuple[str, ...]) -> Dict[int, int]:
+    """
+    Map the index of a >= condition to the index of the <= condition on the
+    same column, for the columns that have exactly one of each.
+    """
+    lower: Dict[str, List[int]] = {}
+    upper: Dict[str, List[int]] = {}
+    for i, (column, operator) in enumerate(zip(filter_cols, filter_ops)):
+        if operator == _OP_GTE:
+            lower.setdefault(column, []).append(i)
+        elif operator == _OP_LTE:
+            upper.setdefault(column, []).append(i)
+            
+    return {
+        lows[0]: upper[column][0]
+        for column, lows in lower.items()
+        if len(lows) == 1 and len(upper.get(column, ())) == 1
+    }
+
+
+@lru_cache(maxsize=256)
+def _criteria(
+    model: Type[ModelType],
+    filter_cols: Tuple[str, ...],
+    filter_ops: Tuple[str, ...],
+    or_filters: Tuple,
+    trashed: Optional[str]
+) -> Tuple:
+    """
+    Build the WHERE criteria of a query shape, shared by the SELECT and the
+    UPDATE/DELETE statements. Values are named bindparams.
+    """
+    criteria = []
+    
+    # WHERE conditions, the most selective first (the bindparam keeps the
+    # index of the condition, so the order does not affect the values)
+    if filter_cols:
+        ranges = _range_pairs(filter_cols, filter_ops)
+        merged = set(ranges.values())
+        conditions = []
+        for i in selectivity_order(filter_ops):
+            if i in merged:
+                continue
+            column = _column(model, filter_cols[i])
+            if i in ranges:
+                # col >= :lo AND col <= :hi is emitted as one BETWEEN
+                conditions.append(column.between(bindparam(f"w{i}"), bindparam(f"w{ranges[i]}")))
+            else:
+                conditions.append(build_condition(column, filter_ops[i], f"w{i}"))
+        criteria.append(and_(*conditions))
+        
+    # OR WHERE conditions
+    if or_filters:
+        criteria.append(or_(*[
+            and_(*[
+                build_condition(_column(model, field), operator, f"o{g}_{i}")
+                for i, (field, operator) in enumerate(group)
+            ])
+            for g, group in enumerate(or_filters)
+        ]))
+        
+    # Soft-delete filter
+    if trashed:
+        column = _column(model, model.DELETED_AT_COLUMN)
+        criteria.append(column.isnot(None) if trashed == 'only' else column.is_(None))
+        
+    return tuple(criteria)
+
+
+@lru_cache(maxsize=256)
+def _compile(model: Type[ModelType], base: Select, shape: Tuple) -> Select:
+    """
+    Build the Select for a given query shape.
+    
+    Literal values (WHERE, OR WHERE, LIMIT, OFFSET) are replaced by named
+    bindparams, so builders that only differ by their values share the same
+    Select and SQLAlchemy's compiled cache.
+    """
+    filter_cols, filter_ops, or_filters, trashed, orders, groups, has_limit, has_offset = shape
+    query = base
+    
+    criteria = _criteria(model, filter_cols, filter_ops, or_filters, trashed)
+    if criteria:
+        query = query.where(*criteria)
+        
+    # Add ORDER BY
+    for column_name, direction in orders:
+        query = query.order_by(_ORDER_FUNCTIONS[direction](_column(model, column_name)))
+        
+    # Add GROUP BY
+    if groups:
+        query = query.group_by(*[_column(model, col) for col in groups])
+        
+    # Add LIMIT/OFFSET
+    if has_limit:
+        query = query.limit(bindparam('limit'))
+    if has_offset:
+        query = query.offset(bindparam('offset'))
+        
+    return query
+
+
+@lru_cache(maxsize=256)
+def _relation_exists(model: Type[ModelType], relation: str, negate: bool) -> Any:
+    """
+    EXISTS criterion of a mapped relationship, or None when `relation` is
+    not a relationship attribute of the model.
+    """
+    attribute = _column(model, relation)
+    prop = getattr(attribute, 'property', None)
+    if not isinstance(prop, RelationshipProperty):
+        return None
+    criterion = attribute.any() if prop.uselist else attribute.has()
+    return ~criterion if negate else criterion
+
+
+@lru_cache(maxsize=256)
+def _restrict(query: Select, criterion: Any) -> Select:
+    """Add a cached criterion to a cached Select, sharing the result."""
+    return query.where(criterion)
+
+
+@lru_cache(maxsize=256)
+def _count_statement(query: Select, wrap: bool) -> Select:
+    """
+    Derive the COUNT statement of a Select, without its ORDER BY (useless
+    to count) unless a LIMIT/OFFSET depends on it.
+    """
+    if not wrap:
+        return query.with_only_columns(func.count(), maintain_column_froms=True).order_by(None)
+    if query._limit_clause is None and query._offset_clause is None:
+        query = query.order_by(None)
+    return select(func.count()).select_from(query.subquery())
+
+
+def _supports_window_functions(dialect: Any) -> bool:
+    """
+    Whether the database accepts COUNT(*) OVER () (SQLite 3.25+, MySQL 8+,
+    MariaDB 10.2+; always true for the other dialects).
+    """
+    version = dialect.server_version_info
+    if not version:
+        return dialect.name not in ('sqlite', 'mysql', 'mariadb')
+    if dialect.name == 'sqlite':
+        return version >= (3, 25)
+    if dialect.name in ('mysql', 'mariadb'):
+        return version >= ((10, 2) if getattr(dialect, 'is_mariadb', False) else (8, 0))
+    return True
+
+
+class _EagerLoadCollector:
+    """
+    Stand-in passed to eager-load callbacks: records the nested with_() and
+    with_joined() calls without building a query. Any other builder method
+    raises, as it cannot be applied to an eager load.
+    """
+    
+    __slots__ = ('eager_loads',)
+    
+    def __init__(self):
+        self.eager_loads: Dict[str, Tuple[Callable, Optional[Callable]]] = {}
+        
+    def with_(self, relation: str, callback: Optional[Callable] = None) -> '_EagerLoadCollector':
+        self.eager_loads[relation] = (selectinload, callback)
+        return self
+        
+    def with_joined(self, relation: str, callback: Optional[Callable] = None) -> '_EagerLoadCollector':
+        self.eager_loads[relation] = (joinedload, callback)
+        return self
+        
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('__'):
+            raise AttributeError(name)
+        raise InvalidQueryException(
+            f"{name}() is not supported in an eager-load callback, only with_() and with_joined()"
+        )
+
+
+def _eager_loader(strategy: Callable, attribute: Any, callback: Optional[Callable]) -> Any:
+    """Build the loader option of a relation, with its nested relations."""
+    loader = strategy(attribute)
+    
+    if callback:
+        collector = _EagerLoadCollector()
+        callback(collector)
+        related = attribute.property.mapper.class_
+        loader = loader.options(*[
+            _eager_loader(nested_strategy, _column(related, relation), nested)
+            for relation, (nested_strategy, nested) in collector.eager_loads.items()
+        ])
+        
+    return loader
+
+
 class QueryBuilder(BuilderInterface):
     """
     Builder to build SQL queries fluently.
@@ -29,8 +273,7 @@ class QueryBuilder(BuilderInterface):
         posts = Post.query()\
             .with_('author')\
             .with_('comments', lambda q:
-                q.where('is_approved', True)\
-                 .with_('author')
+                q.with_('author')
             )\
             .where('is_published', True)\
             .paginate()
@@ -46,18 +289,34 @@ class QueryBuilder(BuilderInterface):
             .get()
     """
     
+    __slots__ = (
+        'model', '_query', '_filter_cols', '_filter_ops', '_filter_vals',
+        '_or_filters', '_eager_loads', '_orders', '_groups', '_limit',
+        '_offset', '_cursor', '_with_trashed', '_only_trashed',
+        '_ignore_soft_delete', '_without_scopes', '_after_load_callbacks'
+    )
+    
     def __init__(self, model: Type[ModelType]):
         super().__init__(model)
-        self._query: Select = select(model)
-        self._filters: List[FilterCondition] = []
-        self._or_filters: List[FilterGroup] = []
-        self._eager_loads: Dict[str, Optional[Callable]] = {}
-        self._orders: List[Dict[str, str]] = []
-        self._groups: List[str] = []
+        self._query: Select = _base_select(model)
+        # WHERE conditions, stored as parallel tuples (columns, operators, values)
+        self._filter_cols: Tuple[str, ...] = ()
+        self._filter_ops: Tuple[str, ...] = ()
+        self._filter_vals: Tuple[Any, ...] = ()
+        self._or_filters: Tuple[FilterGroup, ...] = ()
+        # relation -> (loader strategy, callback for the nested relations)
+        self._eager_loads: Dict[str, Tuple[Callable, Optional[Callable]]] = {}
+        # ORDER BY column -> direction (insertion ordered, replaced on write)
+        self._orders: Dict[str, str] = {}
+        self._groups: Tuple[str, ...] = ()
         self._limit: Optional[int] = None
         self._offset: Optional[int] = None
         self._cursor: Optional[Dict[str, Any]] = None
-        self._after_load_callbacks: List[Callable] = []
+        self._with_trashed: bool = False
+        self._only_trashed: bool = False
+        self._ignore_soft_delete: bool = False
+        self._without_scopes: Tuple[Any, ...] = ()
+        self._after_load_callbacks: Tuple[Callable, ...] = ()
         
     def select(self, *columns: str) -> 'QueryBuilder':
         """
@@ -66,13 +325,13 @@ class QueryBuilder(BuilderInterface):
         Example:
             query.select('name', 'email')
         """
-        self._query = select(*[getattr(self.model, col) for col in columns])
+        self._query = _base_select(self.model, columns)
         return self
         
     def where(
         self,
         column: str,
-        operator: Union[str, Operator] = Operator.EQUAL.value,
+        operator: Union[str, Operator] = _OP_EQ,
         value: Any = None
     ) -> 'QueryBuilder':
         """
@@ -82,12 +341,21 @@ class QueryBuilder(BuilderInterface):
             query.where('age', '>=', 18)
             query.where('status', Operator.EQUAL, 'active')
         """
-        if isinstance(operator, Operator):
-            operator = operator.value
-            
-        self._filters.append(FilterCondition(column, operator, value))
+        operator = operator_value(operator)
+        operator, value = FilterCondition.normalize(operator, value)
+        self._filter_cols = self._filter_cols + (column,)
+        self._filter_ops = self._filter_ops + (operator,)
+        self._filter_vals = self._filter_vals + (value,)
         return self
         
+    @property
+    def filters(self) -> Tuple[FilterCondition, ...]:
+        """The WHERE conditions of the query, as FilterCondition objects."""
+        return tuple(
+            FilterCondition(column, operator, value)
+            for column, operator, value in zip(self._filter_cols, self._filter_ops, self._filter_vals)
+        )
+        
     def or_where(
         self,
         column: str,
@@ -102,7 +370,7 @@ class QueryBuilder(BuilderInterface):
         """
         group = FilterGroup()
         group.add_condition(column, operator, value)
-        self._or_filters.append(group)
+        self._or_filters = self._or_filters + (group,)
         return self
         
     def where_in(self, column: str, values: List[Any]) -> 'QueryBuilder':
@@ -112,7 +380,7 @@ class QueryBuilder(BuilderInterface):
         Example:
             query.where_in('age', [20, 30])
         """
-        return self.where(column, Operator.IN, values)
+        return self.where(column, _OP_IN, values)
         
     def where_not_in(self, column: str, values: List[Any]) -> 'QueryBuilder':
         """
@@ -121,7 +389,7 @@ class QueryBuilder(BuilderInterface):
         Example:
             query.where_not_in('age', [20, 30])
         """
-        return self.where(column, Operator.NOT_IN, values)
+        return self.where(column, _OP_NOT_IN, values)
         
     def where_null(self, column: str) -> 'QueryBuilder':
         """
@@ -130,7 +398,7 @@ class QueryBuilder(BuilderInterface):
         Example:
             query.where_null('age')
         """
-        return self.where(column, Operator.NULL)
+        return self.where(column, _OP_NULL)
         
     def where_not_null(self, column: str) -> 'QueryBuilder':
         """
@@ -139,7 +407,7 @@ class QueryBuilder(BuilderInterface):
         Example:
             query.where_not_null('age')
         """
-        return self.where(column, Operator.NOT_NULL)
+        return self.where(column, _OP_NOT_NULL)
         
     def where_between(self, column: str, values: List[Any]) -> 'QueryBuilder':
         """
@@ -148,7 +416,7 @@ class QueryBuilder(BuilderInterface):
         Example:
             query.where_between('age', [20, 30])
         """
-        return self.where(column, Operator.BETWEEN, values)
+        return self.where(column, _OP_BETWEEN, values)
         
     def where_not_between(self, column: str, values: List[Any]) -> 'QueryBuilder':
         """
@@ -157,7 +425,7 @@ class QueryBuilder(BuilderInterface):
         Example:
             query.where_not_between('age', [20, 30])
         """
-        return self.where(column, Operator.NOT_BETWEEN, values)
+        return self.where(column, _OP_NOT_BETWEEN, values)
         
     def where_like(self, column: str, pattern: str) -> 'QueryBuilder':
         """
@@ -166,7 +434,7 @@ class QueryBuilder(BuilderInterface):
         Example:
             query.where_like('name', '%John%')
         """
-        return self.where(column, Operator.LIKE, pattern)
+        return self.where(column, _OP_LIKE, pattern)
         
     def where_ilike(self, column: str, pattern: str) -> 'QueryBuilder':
         """
@@ -175,7 +443,7 @@ class QueryBuilder(BuilderInterface):
         Example:
             query.where_ilike('name', '%John%')
         """
-        return self.where(column, Operator.ILIKE, pattern)
+        return self.where(column, _OP_ILIKE, pattern)
         
     def where_has(
         self,
@@ -198,6 +466,14 @@ class QueryBuilder(BuilderInterface):
         if not hasattr(self.model, relation):
             raise InvalidQueryException(f"Relation {relation} not found on {self.model.__name__}")
         
+        if callback is None:
+            # Mapped relationship: semi-join on its keys, which the planner
+            # runs as a hash semi-join
+            criterion = _relation_exists(self.model, relation, False)
+            if criterion is not None:
+                self._query = _restrict(self._query, criterion)
+                return self
+                
         relation_obj = getattr(self.model, relation)()
         
         # Create a subquery for the relation
@@ -211,7 +487,7 @@ class QueryBuilder(BuilderInterface):
         subquery = subquery.where(
             relation_obj.get_foreign_key(),
             '=',
-            getattr(self.model, relation_obj.get_local_key())
+            _column(self.model, relation_obj.get_local_key())
         )
         
         # Add the EXISTS condition to the main query
@@ -240,6 +516,14 @@ class QueryBuilder(BuilderInterface):
         if not hasattr(self.model, relation):
             raise InvalidQueryException(f"Relation {relation} not found on {self.model.__name__}")
         
+        if callback is None:
+            # Mapped relationship: anti-join on its keys, which the planner
+            # runs as a hash anti-join
+            criterion = _relation_exists(self.model, relation, True)
+            if criterion is not None:
+                self._query = _restrict(self._query, criterion)
+                return self
+                
         relation_obj = getattr(self.model, relation)()
         
         # Create a subquery for the relation
@@ -253,7 +537,7 @@ class QueryBuilder(BuilderInterface):
         subquery = subquery.where(
             relation_obj.get_foreign_key(),
             '=',
-            getattr(self.model, relation_obj.get_local_key())
+            _column(self.model, relation_obj.get_local_key())
         )
         
         # Add the NOT EXISTS condition to the main query
@@ -269,21 +553,35 @@ class QueryBuilder(BuilderInterface):
         """
         Load a relation eagerly.
         
+        The relation is loaded by a second SELECT ... WHERE key IN (...),
+        which does not multiply the parent rows. The callback may declare
+        nested relations.
+        
         Example:
             query.with_('posts')
-            query.with_('comments', lambda q:
-                q.where('is_approved', True)
+            query.with_('posts', lambda q:
+                q.with_('comments')
             )
         """
-        self._eager_loads[relation] = callback
+        # The relation is marked as loaded on the models by _after_load()
+        self._eager_loads = {**self._eager_loads, relation: (selectinload, callback)}
+        return self
+        
+    def with_joined(
+        self,
+        relation: str,
+        callback: Optional[Callable[['QueryBuilder'], None]] = None
+    ) -> 'QueryBuilder':
+        """
+        Load a relation eagerly with a LEFT OUTER JOIN in the same query.
         
-        # Automatically add the callback to mark the relation as loaded
-        def mark_loaded(model):
-            if not hasattr(model, '_loaded_relations'):
-                model._loaded_relations = set()
-            model._loaded_relations.add(relation)
-        self.after_load(mark_loaded)
+        Suited to many-to-one / one-to-one relations, which do not multiply
+        the parent rows.
         
+        Example:
+            query.with_joined('author')
+        """
+        self._eager_loads = {**self._eager_loads, relation: (joinedload, callback)}
         return self
         
     def order_by(self, column: str, direction: str = 'asc') -> 'QueryBuilder':
@@ -293,11 +591,12 @@ class QueryBuilder(BuilderInterface):
         Example:
             query.order_by('created_at', 'desc')
         """
-        direction = direction.lower()
-        if direction not in ('asc', 'desc'):
-            raise InvalidQueryException(f"Invalid direction: {direction}")
+        normalized = _DIRECTIONS.get(direction) or _DIRECTIONS.get(direction.lower())
+        if normalized is None:
+            raise InvalidQueryException(f"Invalid direction: {direction.lower()}")
             
-        self._orders.append({'column': column, 'direction': direction})
+        # A column ordered twice keeps its position and takes the last direction
+        self._orders = {**self._orders, column: normalized}
         return self
         
     def order_by_desc(self, column: str) -> 'QueryBuilder':
@@ -311,7 +610,7 @@ class QueryBuilder(BuilderInterface):
         Example:
             query.group_by('status', 'role')
         """
-        self._groups.extend(columns)
+        self._groups = self._groups + columns
         return self
         
     def take(self, limit: int) -> 'QueryBuilder':
@@ -361,8 +660,33 @@ class QueryBuilder(BuilderInterface):
         if page < 1:
             raise InvalidQueryException("The page number must be positive")
             
-        total = self.count()
-        items = self.skip((page - 1) * per_page).take(per_page).get()
+        counter = self.clone()
+        self.skip((page - 1) * per_page).take(per_page)
+        
+        # The window COUNT is computed before LIMIT/OFFSET: the page and the
+        # total come back in a single round-trip. Databases without window
+        # functions get a separate COUNT query
+        session = self.model.get_session()
+        windowed = _supports_window_functions(session.connection().dialect)
+        query = self._build_query()
+        if windowed:
+            query = query.add_columns(func.count().over().label('_total'))
+        query = self._add_eager_loads(query)
+        rows = session.execute(query, self._build_params())
+        if self._has_joined_loads():
+            rows = rows.unique()
+        rows = rows.all()
+        
+        items = [row[0] for row in rows]
+        self._run_after_load(items)
+        
+        if rows and windowed:
+            total = rows[0]._total
+        elif rows or page > 1:
+            # No window COUNT, or a page past the end where no row carries it
+            total = counter.count()
+        else:
+            total = 0
         
         return LengthAwarePaginator(
             items=items,
@@ -393,32 +717,38 @@ class QueryBuilder(BuilderInterface):
                 limit=20
             )
         """
-        self._cursor = {
+        # The page is read through a clone: the builder stays reusable for
+        # the next pages
+        builder = self.clone()
+        builder._cursor = {
             'field': cursor_field,
             'after': after,
             'before': before
         }
         
-        self.take(limit + 1)  # +1 to check if there is a next page
-        
-        if after:
-            self.where(cursor_field, '>', after)
-        elif before:
-            self.where(cursor_field, '<', before)
+        if not builder._orders:
+            builder.order_by(cursor_field)
+        if after is not None:
+            builder.where(cursor_field, _OP_GT, after)
+        elif before is not None:
+            builder.where(cursor_field, _OP_LT, before)
             
-        items = self.get()
+        builder._limit = limit + 1  # +1 to check if there is a next page
+        items = builder._execute_query()
         has_more = len(items) > limit
         
         if has_more:
             items = items[:limit]
+        # The lookahead row is dropped before running the callbacks
+        self._run_after_load(items)
             
         return CursorPaginator(
             items=items,
             has_more=has_more,
             cursor_field=cursor_field,
             limit=limit,
-            next_cursor=items[-1].get_attribute(cursor_field) if has_more else None,
-            previous_cursor=items[0].get_attribute(cursor_field) if items else None
+            next_cursor=getattr(items[-1], cursor_field) if has_more else None,
+            previous_cursor=getattr(items[0], cursor_field) if items else None
         )
         
     def get(self) -> List[T]:
@@ -429,13 +759,53 @@ class QueryBuilder(BuilderInterface):
             users = query.where('active', True).get()
         """
         results = self._execute_query()
+        self._run_after_load(results)
+        return results
         
-        # Execute the after_load callbacks
+    def iter_get(self, batch: int = 100) -> Iterator[T]:
+        """
+        Execute the query and iterate over the results without building a list.
+        
+        Example:
+            for user in query.where('active', True).iter_get():
+                send_newsletter(user)
+        """
+        return self._iter(batch)
+        
+    def _run_after_load(self, results: List[T]) -> None:
+        """Execute the after_load callbacks on the loaded models."""
+        callback = self._after_load()
+        if callback is None:
+            return
         for result in results:
-            for callback in self._after_load_callbacks:
+            callback(result)
+        
+    def _after_load(self) -> Optional[Callable[[T], None]]:
+        """
+        Compose the after_load callbacks, and the marking of the eagerly
+        loaded relations, into a single callable (None if there is nothing
+        to run).
+        """
+        callbacks = self._after_load_callbacks
+        if self._eager_loads:
+            relations = frozenset(self._eager_loads)
+            
+            def mark_loaded(model):
+                # Models loaded by the ORM skip __init__ and would otherwise
+                # update the class-level set shared by every instance
+                loaded = model.__dict__.get('_loaded_relations')
+                model._loaded_relations = relations | loaded if loaded else relations
+            callbacks = (mark_loaded,) + callbacks
+            
+        if not callbacks:
+            return None
+        if len(callbacks) == 1:
+            return callbacks[0]
+            
+        def run(result):
+            for callback in callbacks:
                 callback(result)
-                
-        return results
+        return run
         
     def first(self) -> Optional[T]:
         """
@@ -444,8 +814,11 @@ class QueryBuilder(BuilderInterface):
         Example:
             user = query.where('email', email).first()
         """
-        self.take(1)
-        results = self.get()
+        # The LIMIT goes on a (shallow) clone so the builder is left untouched,
+        # while the limited shape still comes from the Select cache
+        limited = self.clone().take(1 if self._limit is None else min(self._limit, 1))
+        results = limited._execute_query()
+        self._run_after_load(results)
         return results[0] if results else None
         
     def find(self, id: Any) -> Optional[T]:
@@ -455,7 +828,25 @@ class QueryBuilder(BuilderInterface):
         Example:
             user = User.query().find(5)
         """
-        return self.where('id', Operator.EQUAL, id).first()
+        if self._is_plain_lookup():
+            # Primary-key lookup: served from the identity map when the model
+            # is already loaded in the session
+            result = self.model.get_session().get(self.model, id)
+            if result is not None:
+                self._run_after_load([result])
+            return result
+            
+        return self.clone().where(_primary_key(self.model), _OP_EQ, id).first()
+        
+    def _is_plain_lookup(self) -> bool:
+        """Check that the query adds no constraint to a primary-key lookup."""
+        return (
+            self._query is _base_select(self.model)
+            and not (self._filter_cols or self._or_filters or self._groups or self._eager_loads)
+            and self._limit is None
+            and self._offset is None
+            and self._trashed() is None
+        )
         
     def find_or_fail(self, id: Any) -> T:
         """
@@ -477,15 +868,14 @@ class QueryBuilder(BuilderInterface):
         Example:
             count = query.where('active', True).count()
         """
-        # Create a subquery with the current filters
-        subquery = self._build_query()
-        
-        # Create a new COUNT query on the subquery
-        count_query = select(func.count()).select_from(subquery)
+        # GROUP BY, LIMIT and OFFSET change the number of rows: they are kept
+        # in a subquery. Otherwise the filtered query is counted directly.
+        wrap = bool(self._groups) or self._limit is not None or self._offset is not None
+        count_query = _count_statement(self._build_query(), wrap)
         
         # Execute the query
         session = self.model.get_session()
-        result = session.execute(count_query).scalar()
+        result = session.scalar(count_query, self._build_params())
         
         return result or 0
         
@@ -497,8 +887,15 @@ class QueryBuilder(BuilderInterface):
             if query.where('email', email).exists():
                 print("Email already used")
         """
-        # Optimise en limitant à 1 résultat
-        return self.take(1).get() != []
+        # SELECT EXISTS (SELECT 1 ... LIMIT 1): no row is transferred and no
+        # model is hydrated
+        limit = 1 if self._limit is None else min(self._limit, 1)
+        query = self._build_query()\
+            .with_only_columns(literal(1), maintain_column_froms=True)\
+            .order_by(None)\
+            .limit(limit)
+        session = self.model.get_session()
+        return bool(session.scalar(select(query.exists()), self._build_params()))
         
     def _execute_query(self, query=None) -> List[T]:
         """
@@ -509,83 +906,60 @@ class QueryBuilder(BuilderInterface):
         """
         if query is None:
             query = self._build_query()
+        query = self._add_eager_loads(query)
         
         session = self.model.get_session()
-        return session.execute(query).scalars().all()
-        
-    def _build_query(self) -> Select:
-        """Build the SQL query with all clauses."""
-        query = self._query
-        
-        # Add WHERE conditions
-        if self._filters:
-            conditions = [self._build_condition(f) for f in self._filters]
-            query = query.where(and_(*conditions))
-            
-        # Add OR WHERE conditions
-        if self._or_filters:
-            or_conditions = [
-                and_(*[self._build_condition(c) for c in group.conditions])
+        results = session.execute(query, self._build_params()).scalars()
+        if self._has_joined_loads():
+            # A joined collection repeats the parent row once per child
+            results = results.unique()
+        return results.all()
+        
+    def _has_joined_loads(self) -> bool:
+        """Check whether a relation is eagerly loaded with a JOIN."""
+        return any(strategy is joinedload for strategy, _ in self._eager_loads.values())
+        
+    def _shape_key(self) -> Tuple:
+        """Structural shape of the query, without the literal values."""
+        return (
+            self._filter_cols,
+            self._filter_ops,
+            tuple(
+                tuple((c.field, c.operator) for c in group.conditions)
                 for group in self._or_filters
-            ]
-            query = query.where(or_(*or_conditions))
-            
-        # Add ORDER BY
-        for order in self._orders:
-            column = getattr(self.model, order['column'])
-            query = query.order_by(
-                desc(column) if order['direction'] == 'desc' else asc(column)
-            )
-            
-        # Add GROUP BY
-        if self._groups:
-            query = query.group_by(*[getattr(self.model, col) for col in self._groups])
-            
-        # Add LIMIT/OFFSET
+            ),
+            self._trashed(),
+            tuple(self._orders.items()),
+            self._groups,
+            self._limit is not None,
+            self._offset is not None
+        )
+        
+    def _trashed(self) -> Optional[str]:
+        """Soft-delete filter of the query: 'without', 'only' or None."""
+        if not getattr(self.model, '_soft_deletes', False):
+            return None
+        if self._only_trashed:
+            return 'only'
+        return None if self._with_trashed else 'without'
+        
+    def _build_params(self) -> Dict[str, Any]:
+        """Values bound to the bindparams of the cached Select."""
+        params: Dict[str, Any] = {}
+        for i, (operator, value) in enumerate(zip(self._filter_ops, self._filter_vals)):
+            bind_value(params, f"w{i}", operator, value)
+        for g, group in enumerate(self._or_filters):
+            for i, condition in enumerate(group.conditions):
+                bind_value(params, f"o{g}_{i}", condition.operator, condition.value)
         if self._limit is not None:
-            query = query.limit(self._limit)
+            params['limit'] = self._limit
         if self._offset is not None:
-            query = query.offset(self._offset)
-            
-        return query 
-
-    def _build_condition(self, condition: FilterCondition) -> Any:
-        """
-        Build an SQL condition from a FilterCondition.
+            params['offset'] = self._offset
+        return params
         
-        Args:
-            condition: The condition to build
-            
-        Returns:
-            An SQLAlchemy expression
-        """
-        column = getattr(self.model, condition.field)
-        
-        if condition.operator == Operator.NULL.value:
-            return column.is_(None)
-            
-        if condition.operator == Operator.NOT_NULL.value:
-            return column.isnot(None)
-            
-        if condition.operator == Operator.IN.value:
-            return column.in_(condition.value)
-            
-        if condition.operator == Operator.NOT_IN.value:
-            return ~column.in_(condition.value)
-            
-        if condition.operator == Operator.BETWEEN.value:
-            return column.between(*condition.value)
-            
-        if condition.operator == Operator.NOT_BETWEEN.value:
-            return ~column.between(*condition.value)
-            
-        if condition.operator == Operator.LIKE.value:
-            return column.like(condition.value)
-            
-        if condition.operator == Operator.ILIKE.value:
-            return column.ilike(condition.value)
-            
-        return column.op(condition.operator)(condition.value)
+    def _build_query(self) -> Select:
+        """Return the (cached) SQL query for the current shape."""
+        return _compile(self.model, self._query, self._shape_key())
         
     def _add_eager_loads(self, query: Select) -> Select:
         """
@@ -597,15 +971,8 @@ class QueryBuilder(BuilderInterface):
         Returns:
             The modified query
         """
-        for relation, callback in self._eager_loads.items():
-            loader = joinedload(getattr(self.model, relation))
-            
-            if callback:
-                subquery = QueryBuilder(self.model)
-                callback(subquery)
-                loader = loader.options(*subquery._eager_loads)
-                
-            query = query.options(loader)
+        for relation, (strategy, callback) in self._eager_loads.items():
+            query = query.options(_eager_loader(strategy, _column(self.model, relation), callback))
             
         return query
         
@@ -618,7 +985,7 @@ class QueryBuilder(BuilderInterface):
         Example:
             max_price = Product.query().max('price')
         """
-        return self.select(func.max(getattr(self.model, column))).scalar()
+        return self._aggregate(func.max, column)
         
     def min(self, column: str) -> Any:
         """
@@ -627,7 +994,7 @@ class QueryBuilder(BuilderInterface):
         Example:
             min_age = User.query().min('age')
         """
-        return self.select(func.min(getattr(self.model, column))).scalar()
+        return self._aggregate(func.min, column)
         
     def sum(self, column: str) -> Any:
         """
@@ -636,7 +1003,7 @@ class QueryBuilder(BuilderInterface):
         Example:
             total_sales = Order.query().sum('amount')
         """
-        return self.select(func.sum(getattr(self.model, column))).scalar()
+        return self._aggregate(func.sum, column)
         
     def avg(self, column: str) -> float:
         """
@@ -645,7 +1012,24 @@ class QueryBuilder(BuilderInterface):
         Example:
             avg_rating = Product.query().avg('rating')
         """
-        return self.select(func.avg(getattr(self.model, column))).scalar()
+        return self._aggregate(func.avg, column)
+        
+    def _aggregate(self, function: Callable, column: str) -> Any:
+        """Execute an aggregate function on a column of the filtered query."""
+        query = self._build_query()
+        if self._groups or self._limit is not None or self._offset is not None:
+            # GROUP BY, LIMIT and OFFSET change the rows, as in count(): the
+            # aggregate runs over the query kept in a subquery
+            subquery = query.subquery()
+            if column not in subquery.c:
+                raise InvalidQueryException(f"Column {column} is not selected by the query")
+            query = select(function(subquery.c[column]))
+        else:
+            query = query\
+                .with_only_columns(function(_column(self.model, column)))\
+                .order_by(None)
+        session = self.model.get_session()
+        return session.scalar(query, self._build_params())
         
     def chunk(self, count: int, callback: Callable[[List[T]], None]) -> bool:
         """
@@ -662,30 +1046,85 @@ class QueryBuilder(BuilderInterface):
                     process_user(user)
             )
         """
-        page = 1
+        if not self._can_chunk_by_key():
+            return self._chunk_by_offset(count, callback)
+            
+        # Keyset pagination on the primary key: each batch is an index range
+        # scan (WHERE id > last_id) instead of an ever-growing OFFSET
+        # One extra row is fetched to know whether another batch follows
+        key = _primary_key(self.model)
+        base = self.clone().order_by(key).take(count + 1)
+        last_id = None
         
         while True:
-            results = self.skip((page - 1) * count).take(count).get()
+            batch = base.clone()
+            if last_id is not None:
+                batch.where(key, _OP_GT, last_id)
+            results = batch._execute_query()
             
             if not results:
                 break
                 
+            has_more = len(results) > count
+            results = results[:count]
+            # The lookahead row is dropped before running the callbacks: it
+            # comes back as the first row of the next batch
+            self._run_after_load(results)
             callback(results)
             
-            if len(results) < count:
+            if not has_more:
                 break
                 
-            page += 1
+            last_id = getattr(results[-1], key)
             
         return True
         
+    def _can_chunk_by_key(self) -> bool:
+        """
+        Keyset chunking needs whole model rows (to read the primary key) and
+        must not override a user ordering, grouping, LIMIT or OFFSET.
+        """
+        if self._orders or self._groups or self._limit is not None or self._offset is not None:
+            return False
+        descriptions = self._query.column_descriptions
+        return len(descriptions) == 1 and descriptions[0]['expr'] is self.model
+        
+    def _chunk_by_offset(self, count: int, callback: Callable[[List[T]], None]) -> bool:
+        """
+        Process results in chunks with OFFSET, keeping the user-defined
+        ordering and walking within the user's skip()/take() window.
+        """
+        offset = self._offset or 0
+        remaining = self._limit
+        
+        while remaining is None or remaining > 0:
+            size = count if remaining is None else min(count, remaining)
+            results = self.clone().skip(offset).take(size + 1)._execute_query()
+            
+            if not results:
+                break
+                
+            has_more = len(results) > size
+            results = results[:size]
+            self._run_after_load(results)
+            callback(results)
+            
+            if not has_more:
+                break
+                
+            offset += size
+            if remaining is not None:
+                remaining -= size
+                
+        return True
+        
     def each(self, callback: Callable[[T], None], count: int = 100) -> bool:
         """
-        Process each result individually in chunks.
+        Process each result individually, streaming the rows.
         
         Args:
             callback: Function to call for each element
-            count: The size of the chunk
+            count: The number of rows fetched at a time
             
         Example:
             User.query().each(lambda user:
@@ -693,7 +1132,29 @@ class QueryBuilder(BuilderInterface):
                 process_user(user)
             )
         """
-        return self.chunk(count, lambda results: [callback(result) for result in results])
+        for result in self._iter(count):
+            callback(result)
+        return True
+        
+    def _iter(self, batch: int = 100) -> Iterator[T]:
+        """
+        Stream the results with a single statement, fetching `batch` rows at a
+        time from the cursor instead of materializing the whole list.
+        """
+        # Joined collections cannot be streamed (SQLAlchemy rejects yield_per
+        # with a joined eager load): fall back to the buffered get(). with_()
+        # relations are loaded by a SELECT ... IN per fetched batch
+        if self._has_joined_loads():
+            yield from self.get()
+            return
+            
+        query = self._add_eager_loads(self._build_query()).execution_options(yield_per=batch)
+        session = self.model.get_session()
+        callback = self._after_load()
+        for result in session.execute(query, self._build_params()).scalars():
+            if callback is not None:
+                callback(result)
+            yield result
         
     def update(self, values: Dict[str, Any]) -> int:
         """
@@ -705,17 +1166,16 @@ class QueryBuilder(BuilderInterface):
                 .where('last_login', '<', '2023-01-01')\
                 .update({'status': 'inactive'})
         """
-        query = self._build_query()
-        result = self.model.session.execute(
-            query.update().values(**values)
-        )
-        self.model.session.commit()
-        return result.rowcount
+        statement = sa_update(self.model).values(values)
+        return self._execute_dml(statement)
         
     def delete(self) -> int:
         """
         Delete the records that match the query.
         
+        Soft-deleting models get their deleted_at column set instead, unless
+        called through force_delete().
+        
         Example:
             # Delete all unpublished posts
             Post.query()\
@@ -723,9 +1183,37 @@ class QueryBuilder(BuilderInterface):
                 .where('created_at', '<', '2023-01-01')\
                 .delete()
         """
-        query = self._build_query()
-        result = self.model.session.execute(query.delete())
-        self.model.session.commit()
+        if getattr(self.model, '_soft_deletes', False) and not self._ignore_soft_delete:
+            return self.update({self.model.DELETED_AT_COLUMN: datetime.now()})
+            
+        return self._execute_dml(sa_delete(self.model))
+        
+    def _execute_dml(self, statement: Any) -> int:
+        """
+        Execute an UPDATE/DELETE restricted by the WHERE criteria of the query
+        and return the number of affected rows.
+        """
+        criteria = _criteria(self.model, *self._shape_key()[:4])
+        if self._query.whereclause is not None:
+            # where_has() / where_doesnt_have() conditions
+            criteria = criteria + (self._query.whereclause,)
+        if criteria:
+            statement = statement.where(*criteria)
+            
+        params = self._build_params()
+        params.pop('limit', None)
+        params.pop('offset', None)
+        
+        session = self.model.get_session()
+        try:
+            result = session.execute(
+                statement.execution_options(synchronize_session=False),
+                params
+            )
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
         return result.rowcount
         
     def force_delete(self) -> int:
@@ -775,6 +1263,8 @@ class QueryBuilder(BuilderInterface):
                 .where('deleted_at', '>', '2023-01-01')\
                 .restore()
         """
+        if not self._only_trashed:
+            self._with_trashed = True
         return self.update({self.model.DELETED_AT_COLUMN: None})
         
     # Méthodes de gestion des scopes
@@ -796,7 +1286,7 @@ class QueryBuilder(BuilderInterface):
         Example:
             query.without_global_scope(SoftDeleteScope)
         """
-        self._without_scopes.append(scope)
+        self._without_scopes = self._without_scopes + (scope,)
         return self
         
     def without_global_scopes(self) -> 'QueryBuilder':
@@ -806,7 +1296,7 @@ class QueryBuilder(BuilderInterface):
         Example:
             query.without_global_scopes().get()
         """
-        self._without_scopes = list(self.model.get_global_scopes().values())
+        self._without_scopes = tuple(self.model._global_scopes)
         return self
         
     # Méthodes utilitaires
@@ -818,18 +1308,9 @@ class QueryBuilder(BuilderInterface):
         Example:
             new_query = query.clone()
         """
-        clone = QueryBuilder(self.model)
-        clone._query = self._query
-        clone._filters = self._filters.copy()
-        clone._or_filters = self._or_filters.copy()
-        clone._eager_loads = self._eager_loads.copy()
-        clone._orders = self._orders.copy()
-        clone._groups = self._groups.copy()
-        clone._limit = self._limit
-        clone._offset = self._offset
-        clone._cursor = self._cursor.copy() if self._cursor else None
-        clone._after_load_callbacks = self._after_load_callbacks.copy()
-        return clone
+        # Internal collections are tuples or replaced-on-write dicts, so a
+        # shallow copy shares them safely with the original builder.
+        return copy.copy(self)
         
     def tap(self, callback: Callable[['QueryBuilder'], None]) -> 'QueryBuilder':
         """
@@ -866,5 +1347,5 @@ class QueryBuilder(BuilderInterface):
         
     def after_load(self, callback: Callable) -> 'QueryBuilder':
         """Add a callback to execute after loading"""
-        self._after_load_callbacks.append(callback)
+        self._after_load_callbacks = self._after_load_callbacks + (callback,)
         return self 
\ No newline at end of file
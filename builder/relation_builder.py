@@ -1,12 +1,15 @@
-from typing import Any, Dict, List, Optional, Union, Type, TypeVar, Callable
-from sqlalchemy import select, and_, or_, desc, asc
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Union, Type, TypeVar, Callable, Tuple
+from sqlalchemy import select, and_, or_, bindparam
 from sqlalchemy.sql import Select
 from sqlalchemy.orm import joinedload, contains_eager
 
 from ..types import ModelType, FilterValue, FilterOperator
 from ..filters import Filter, FilterGroup, FilterCondition, Operator
+from ..filters.operators import operator_value
 from ..exceptions import InvalidQueryException, RelationNotLoadedException
-from .query_builder import QueryBuilder
+from .conditions import build_condition, bind_value
+from .query_builder import QueryBuilder, _column, _DIRECTIONS, _ORDER_FUNCTIONS
 
 T = TypeVar('T', bound=ModelType)
 
@@ -24,8 +27,7 @@ class RelationBuilder(QueryBuilder):
         # Avec relations imbriquées
         posts = user.posts()\
             .with_('comments', lambda q:
-                q.where('is_approved', True)\
-                 .with_('author')
+                q.with_('author')
             )\
             .where('views', '>', 1000)\
             .get()
@@ -37,13 +39,20 @@ class RelationBuilder(QueryBuilder):
             .get()
     """
     
+    # Les slots de QueryBuilder sont hérités : seuls les attributs propres à la relation sont déclarés
+    __slots__ = (
+        'parent', 'table', 'foreign_key', 'local_key', 'related_key',
+        '_pivot_columns', '_pivot_wheres', '_pivot_orders', '_core'
+    )
+    
     def __init__(
         self,
         parent: ModelType,
         related: Type[ModelType],
         table: Optional[str] = None,
         foreign_key: Optional[str] = None,
-        local_key: str = 'id'
+        local_key: str = 'id',
+        related_key: Optional[str] = None
     ):
         """
         Initialise le builder de relation.
@@ -54,15 +63,18 @@ class RelationBuilder(QueryBuilder):
             table: Nom de la table pivot (pour many-to-many)
             foreign_key: Clé étrangère
             local_key: Clé locale
+            related_key: Clé du modèle lié dans la table pivot (pour many-to-many)
         """
         super().__init__(related)
         self.parent = parent
         self.table = table
         self.foreign_key = foreign_key
         self.local_key = local_key
-        self._pivot_columns: List[str] = []
-        self._pivot_wheres: List[FilterCondition] = []
-        self._pivot_orders: List[Dict[str, str]] = []
+        self.related_key = related_key
+        self._pivot_columns: Tuple[str, ...] = ()
+        self._pivot_wheres: Tuple[FilterCondition, ...] = ()
+        self._pivot_orders: Tuple[Dict[str, str], ...] = ()
+        self._core: bool = False
         
     def with_pivot(self, *columns: str) -> 'RelationBuilder[T]':
         """
@@ -73,7 +85,7 @@ class RelationBuilder(QueryBuilder):
                 .with_pivot('expires_at', 'created_at')\
                 .get()
         """
-        self._pivot_columns.extend(columns)
+        self._pivot_columns = self._pivot_columns + columns
         return self
         
     def where_pivot(
@@ -90,10 +102,8 @@ class RelationBuilder(QueryBuilder):
                 .where_pivot('expires_at', '>', 'now()')\
                 .get()
         """
-        if isinstance(operator, Operator):
-            operator = operator.value
-            
-        self._pivot_wheres.append(FilterCondition(column, operator, value))
+        operator = operator_value(operator)
+        self._pivot_wheres = self._pivot_wheres + (FilterCondition(column, operator, value),)
         return self
         
     def order_by_pivot(
@@ -109,88 +119,134 @@ class RelationBuilder(QueryBuilder):
                 .order_by_pivot('created_at', 'desc')\
                 .get()
         """
-        direction = direction.lower()
-        if direction not in ('asc', 'desc'):
-            raise InvalidQueryException(f"Direction invalide: {direction}")
+        normalized = _DIRECTIONS.get(direction) or _DIRECTIONS.get(direction.lower())
+        if normalized is None:
+            raise InvalidQueryException(f"Direction invalide: {direction.lower()}")
             
-        self._pivot_orders.append({
+        self._pivot_orders = self._pivot_orders + ({
             'column': column,
-            'direction': direction
-        })
+            'direction': normalized
+        },)
         return self
         
-    def _build_query(self) -> Select:
-        """Construit la requête SQL finale avec les jointures."""
-        query = super()._build_query()
-        
-        # Ajoute la jointure de base
-        if self.table:  # Many-to-many
-            query = self._add_pivot_join(query)
-        else:  # One-to-many ou One-to-one
-            query = query.join(
-                self.model,
-                getattr(self.model, self.foreign_key) == getattr(self.parent, self.local_key)
-            )
-            
-        # Ajoute les conditions sur la table pivot
-        if self._pivot_wheres:
-            for condition in self._pivot_wheres:
-                query = query.where(self._build_pivot_condition(condition))
+    def as_core(self) -> 'RelationBuilder[T]':
+        """
+        Exécute la requête en SQL Core : get() et first() renvoient des
+        lignes en lecture seule (RowMapping) au lieu d'instances du modèle,
+        sans hydratation ORM ni identity map. Les colonnes pivot sont
+        exposées sous leur label pivot_<colonne>.
+        
+        Example:
+            rows = user.roles()\
+                .with_pivot('expires_at')\
+                .as_core()\
+                .get()
                 
-        # Ajoute les ORDER BY sur la table pivot
-        for order in self._pivot_orders:
-            column = getattr(self.table, order['column'])
-            query = query.order_by(
-                desc(column) if order['direction'] == 'desc' else asc(column)
-            )
-            
-        return query
+            rows[0]['name'], rows[0]['pivot_expires_at']
+        """
+        self._core = True
+        return self
         
-    def _add_pivot_join(self, query: Select) -> Select:
-        """Ajoute la jointure pour une relation many-to-many."""
-        query = query.join(
+    def _execute_query(self, query=None) -> List[Any]:
+        """Exécute la requête, en Core si as_core() a été appelé."""
+        if not self._core:
+            return super()._execute_query(query)
+        if query is None:
+            query = self._build_query()
+        session = self.model.get_session()
+        return session.execute(_core_statement(query), self._build_params()).mappings().all()
+        
+    def _after_load(self) -> Optional[Callable[[Any], None]]:
+        """Les callbacks after_load attendent des modèles : ignorés en Core."""
+        if self._core:
+            return None
+        return super()._after_load()
+        
+    def _is_plain_lookup(self) -> bool:
+        """Une relation contraint toujours la requête (jointure, pivot)."""
+        return False
+        
+    def _build_query(self) -> Select:
+        """Construit la requête SQL finale avec les jointures (mise en cache par forme)."""
+        return _compile_relation(
+            super()._build_query(),
+            self.model,
             self.table,
+            self.foreign_key,
+            self.related_key if self.table else None,
+            self._pivot_columns,
+            tuple((condition.field, condition.operator) for condition in self._pivot_wheres),
+            tuple((order['column'], order['direction']) for order in self._pivot_orders)
+        )
+        
+    def _build_params(self) -> Dict[str, Any]:
+        """Valeurs liées aux bindparams du Select mis en cache."""
+        params = super()._build_params()
+        params['parent_key'] = getattr(self.parent, self.local_key)
+        for i, condition in enumerate(self._pivot_wheres):
+            bind_value(params, f"pw{i}", condition.operator, condition.value)
+        return params
+
+
+@lru_cache(maxsize=256)
+def _compile_relation(
+    query: Select,
+    model: Type[ModelType],
+    table: Any,
+    foreign_key: str,
+    related_key: Optional[str],
+    pivot_columns: Tuple[str, ...],
+    pivot_wheres: Tuple[Tuple[str, str], ...],
+    pivot_orders: Tuple[Tuple[str, str], ...]
+) -> Select:
+    """
+    Ajoute les jointures de la relation au Select de base.
+    
+    La clé du parent et les valeurs des conditions pivot sont des bindparams
+    (parent_key, pw{i}) : toutes les instances parentes partagent le même
+    Select, et donc le cache de compilation de SQLAlchemy.
+    """
+    parent_key = bindparam('parent_key')
+    
+    # Ajoute la jointure de base
+    if table:  # Many-to-many
+        query = query.join(
+            table,
             and_(
-                getattr(self.table, self.foreign_key) == getattr(self.parent, self.local_key),
-                getattr(self.model, 'id') == getattr(self.table, self.related_key)
+                getattr(table, foreign_key) == parent_key,
+                _column(model, 'id') == getattr(table, related_key)
             )
         )
         
         # Ajoute les colonnes de la table pivot
-        if self._pivot_columns:
-            for column in self._pivot_columns:
-                query = query.add_columns(
-                    getattr(self.table, column).label(f"pivot_{column}")
-                )
-                
-        return query
+        if pivot_columns:
+            query = query.add_columns(*(
+                getattr(table, column).label(f"pivot_{column}") for column in pivot_columns
+            ))
+    else:  # One-to-many ou One-to-one : simple filtre sur la clé étrangère
+        query = query.where(_column(model, foreign_key) == parent_key)
         
-    def _build_pivot_condition(self, condition: FilterCondition) -> Any:
-        """Construit une condition SQL pour la table pivot."""
-        column = getattr(self.table, condition.field)
+    # Ajoute les conditions sur la table pivot en un seul appel
+    if pivot_wheres:
+        query = query.where(*(
+            build_condition(getattr(table, field), operator, f"pw{i}")
+            for i, (field, operator) in enumerate(pivot_wheres)
+        ))
         
-        if condition.operator == Operator.NULL.value:
-            return column.is_(None)
-            
-        if condition.operator == Operator.NOT_NULL.value:
-            return column.isnot(None)
-            
-        if condition.operator == Operator.IN.value:
-            return column.in_(condition.value)
-            
-        if condition.operator == Operator.NOT_IN.value:
-            return ~column.in_(condition.value)
-            
-        if condition.operator == Operator.BETWEEN.value:
-            return column.between(*condition.value)
-            
-        if condition.operator == Operator.NOT_BETWEEN.value:
-            return ~column.between(*condition.value)
-            
-        if condition.operator == Operator.LIKE.value:
-            return column.like(condition.value)
-            
-        if condition.operator == Operator.ILIKE.value:
-            return column.ilike(condition.value)
-            
-        return column.op(condition.operator)(condition.value) 
\ No newline at end of file
+    # Ajoute les ORDER BY sur la table pivot en un seul appel
+    if pivot_orders:
+        query = query.order_by(*(
+            _ORDER_FUNCTIONS[direction](getattr(table, field))
+            for field, direction in pivot_orders
+        ))
+        
+    return query
+
+
+@lru_cache(maxsize=256)
+def _core_statement(query: Select) -> Select:
+    """
+    Remplace l'entité du Select par les colonnes de sa table : les lignes
+    sont renvoyées telles quelles, sans construction d'instances ORM.
+    """
+    return query.with_only_columns(*query.selected_columns, maintain_column_froms=True)
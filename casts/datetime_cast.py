@@ -1,7 +1,13 @@
+import re
 from datetime import datetime
 from typing import Any, Optional
 from .interfaces import CastInterface
 
+# Forme canonique produite par datetime.isoformat() (chiffres ASCII) : une
+# chaîne valide dans cette forme est renvoyée telle quelle par to_database
+_ISO_RE = re.compile(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d{6})?([+-]\d{2}:\d{2})?', re.ASCII)
+
+
 class DateTimeCast(CastInterface[datetime]):
     """
     Cast pour les champs datetime.
@@ -23,7 +29,7 @@ class DateTimeCast(CastInterface[datetime]):
         if isinstance(value, datetime):
             return value
         try:
-            return datetime.fromisoformat(str(value))
+            return datetime.fromisoformat(value if isinstance(value, str) else str(value))
         except (ValueError, TypeError):
             return None
             
@@ -33,6 +39,10 @@ class DateTimeCast(CastInterface[datetime]):
         if isinstance(value, datetime):
             return value.isoformat()
         try:
+            if isinstance(value, str) and _ISO_RE.fullmatch(value):
+                # Déjà canonique : la date est validée, sans re-sérialisation
+                datetime.fromisoformat(value)
+                return value
             return datetime.fromisoformat(str(value)).isoformat()
         except (ValueError, TypeError):
             return None 
\ No newline at end of file
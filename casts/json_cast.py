@@ -1,7 +1,57 @@
 import json
-from typing import Any, Dict
+import re
+from datetime import date, time
+from types import MappingProxyType
+from typing import Any, Dict, Mapping
 from .interfaces import CastInterface
 
+# Dictionnaire vide partagé et immuable, renvoyé aux appelants qui ne
+# modifient pas la valeur : évite une allocation par cellule NULL
+_EMPTY: Mapping = MappingProxyType({})
+
+# orjson (optionnel) accélère la lecture ; l'écriture passe toujours par
+# json pour que le texte stocké ne dépende pas de sa présence
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Entier hors de la plage 64 bits d'orjson (qu'il décode en float)
+_BIG_INT = re.compile(r'[0-9]{20}')
+_BIG_INT_BYTES = re.compile(rb'[0-9]{20}')
+
+
+def _default(value: Any) -> str:
+    """Encode les dates en ISO 8601, comme orjson ; refuse les autres types."""
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, default=_default)
+
+
+if orjson is not None:
+    def _loads(value: Any) -> Any:
+        if isinstance(value, str):
+            pattern = _BIG_INT
+        elif isinstance(value, (bytes, bytearray)):
+            pattern = _BIG_INT_BYTES
+        else:
+            # Type non JSON : même erreur que sans orjson
+            return json.loads(value)
+        if pattern.search(value):
+            return json.loads(value)
+        try:
+            return orjson.loads(value)
+        except orjson.JSONDecodeError:
+            # NaN/Infinity écrits par json : seul json sait les relire
+            return json.loads(value)
+else:
+    _loads = json.loads
+
+
 class JsonCast(CastInterface[Dict]):
     """
     Cast pour les champs JSON/dictionnaire.
@@ -17,15 +67,19 @@ class JsonCast(CastInterface[Dict]):
         # Accessible comme user.settings['theme']
     """
     
-    def to_python(self, value: Any) -> Dict:
+    def to_python(self, value: Any, *, mutable: bool = True) -> Dict:
+        """
+        Décode une valeur JSON. Avec mutable=False, une valeur NULL ou
+        invalide donne le dictionnaire vide partagé (en lecture seule).
+        """
         if value is None:
-            return {}
+            return {} if mutable else _EMPTY
         if isinstance(value, dict):
             return value
         try:
-            return json.loads(value)
+            return _loads(value)
         except (TypeError, json.JSONDecodeError):
-            return {}
+            return {} if mutable else _EMPTY
             
     def to_database(self, value: Dict) -> str:
         if value is None:
@@ -33,8 +87,8 @@ class JsonCast(CastInterface[Dict]):
         if isinstance(value, str):
             try:
                 # Vérifie que c'est du JSON valide
-                json.loads(value)
+                _loads(value)
                 return value
             except json.JSONDecodeError:
-                return json.dumps({})
-        return json.dumps(value) 
\ No newline at end of file
+                return _dumps({})
+        return _dumps(value)
@@ -1,6 +1,10 @@
-from typing import Dict, Type, Any
+from functools import lru_cache
+from typing import Callable, Dict, Set, Type, Any
 from .interfaces import CastInterface
 
+# Types de valeurs (hashables et bon marché) dont le cast peut être mémoïsé
+_PRIMITIVES = frozenset({str, int, bool, float, type(None)})
+
 class CastRegistry:
     """
     Registre global des casts disponibles.
@@ -18,17 +22,60 @@ class CastRegistry:
     
     _casts: Dict[str, Type[CastInterface]] = {}
     
+    # Instances partagées des classes de cast, et fonctions to_python résolues
+    _instances: Dict[str, CastInterface] = {}
+    _resolvers: Dict[str, Callable[[Any], Any]] = {}
+    
+    # Casts purs renvoyant des valeurs immuables : leurs résultats sur des
+    # valeurs primitives sont mémoïsés (jamais json, dont le dict est modifiable)
+    _cacheable: Set[str] = {'bool', 'int', 'float', 'str', 'datetime'}
+    
     @classmethod
     def register(cls, name: str, cast: Type[CastInterface]):
         """Enregistre un nouveau type de cast."""
         cls._casts[name] = cast
+        cls._instances.pop(name, None)
+        cls._resolvers.pop(name, None)
+        # Un cast personnalisé n'est pas supposé pur
+        cls._cacheable.discard(name)
+        cls._cached.cache_clear()
         
     @classmethod
     def get(cls, name: str) -> Type[CastInterface]:
         """Récupère une classe de cast par son nom."""
-        if name not in cls._casts:
-            raise ValueError(f"Cast non trouvé: {name}")
-        return cls._casts[name]
+        try:
+            return cls._casts[name]
+        except KeyError:
+            raise ValueError(f"Cast non trouvé: {name}") from None
+            
+    @classmethod
+    def instance(cls, name: str) -> CastInterface:
+        """Récupère l'instance (partagée) d'une classe de cast."""
+        try:
+            return cls._instances[name]
+        except KeyError:
+            return cls._instances.setdefault(name, cls.get(name)())
+            
+    @classmethod
+    def resolver(cls, name: str) -> Callable[[Any], Any]:
+        """
+        Récupère la fonction de conversion vers Python d'un cast : la méthode
+        to_python de son instance partagée, ou la fonction enregistrée
+        elle-même pour les casts simples (bool, int...).
+        
+        Example:
+            to_python = CastRegistry.resolver('json')
+            values = [to_python(raw) for raw in rows]
+        """
+        try:
+            return cls._resolvers[name]
+        except KeyError:
+            cast = cls.get(name)
+            if isinstance(cast, type) and issubclass(cast, CastInterface):
+                resolved = cls.instance(name).to_python
+            else:
+                resolved = cast
+            return cls._resolvers.setdefault(name, resolved)
         
     @classmethod
     def cast(cls, value: Any, cast_type: str) -> Any:
@@ -39,18 +86,32 @@ class CastRegistry:
             value = CastRegistry.cast('{"key": "value"}', 'json')
             # Retourne {'key': 'value'}
         """
-        cast_class = cls.get(cast_type)
-        return cast_class().to_python(value)
+        if cast_type in cls._cacheable and type(value) in _PRIMITIVES:
+            return cls._cached(cast_type, value)
+        to_python = cls._resolvers.get(cast_type) or cls.resolver(cast_type)
+        return to_python(value)
+        
+    @staticmethod
+    @lru_cache(maxsize=4096, typed=True)
+    def _cached(cast_type: str, value: Any) -> Any:
+        """Résultat mémoïsé d'un cast pur sur une valeur primitive."""
+        return CastRegistry.resolver(cast_type)(value)
 
 # Enregistrement des casts par défaut
 from .json_cast import JsonCast
 from .datetime_cast import DateTimeCast
 
-CastRegistry._casts.update({
-    'json': JsonCast,
-    'datetime': DateTimeCast,
-    'bool': lambda x: bool(x),
+# Casts scalaires : de simples fonctions appelées directement (bool est le
+# builtin lui-même), sans instance de CastInterface
+_SCALAR: Dict[str, Callable[[Any], Any]] = {
+    'bool': bool,
     'int': lambda x: int(x) if x is not None else None,
     'float': lambda x: float(x) if x is not None else None,
     'str': lambda x: str(x) if x is not None else None,
-}) 
\ No newline at end of file
+}
+
+CastRegistry._casts.update({
+    'json': JsonCast,
+    'datetime': DateTimeCast,
+    **_SCALAR,
+})
\ No newline at end of file
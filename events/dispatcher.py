@@ -1,4 +1,4 @@
-from typing import Callable, Dict, List, Any
+from typing import Callable, Dict, List, Any, Tuple
 from .interfaces import EventDispatcherInterface
 
 class EventDispatcher(EventDispatcherInterface):
@@ -6,6 +6,9 @@ class EventDispatcher(EventDispatcherInterface):
     
     _listeners: Dict[str, List[Callable]] = {}
     _wildcards: List[Callable] = []
+    # Cache par événement : (wildcards, listeners) figés, invalidé par toute
+    # méthode qui modifie _listeners ou _wildcards
+    _resolved: Dict[str, Tuple[Tuple[Callable, ...], Tuple[Callable, ...]]] = {}
     
     @classmethod
     def listen(cls, event: str, callback: Callable) -> None:
@@ -13,20 +16,45 @@ class EventDispatcher(EventDispatcherInterface):
         if event not in cls._listeners:
             cls._listeners[event] = []
         cls._listeners[event].append(callback)
+        cls._resolved.clear()
         
     @classmethod
     def listen_any(cls, callback: Callable) -> None:
         """Ajoute un listener pour tous les événements"""
         cls._wildcards.append(callback)
+        cls._resolved.clear()
+        
+    @classmethod
+    def forget(cls, event: str) -> None:
+        """Retire tous les listeners d'un événement"""
+        cls._listeners.pop(event, None)
+        cls._resolved.clear()
+        
+    @classmethod
+    def flush(cls) -> None:
+        """Retire tous les listeners, wildcards compris"""
+        cls._listeners.clear()
+        cls._wildcards.clear()
+        cls._resolved.clear()
+        
+    @classmethod
+    def _resolve(cls, event: str) -> Tuple[Tuple[Callable, ...], Tuple[Callable, ...]]:
+        """Fige et met en cache les listeners d'un événement"""
+        resolved = cls._resolved[event] = (
+            tuple(cls._wildcards),
+            tuple(cls._listeners.get(event, ()))
+        )
+        return resolved
         
     @classmethod
     def dispatch(cls, event: str, model: Any, *args) -> None:
         """Dispatch un événement aux listeners"""
+        wildcards, listeners = cls._resolved.get(event) or cls._resolve(event)
+        
         # Appelle les wildcards
-        for listener in cls._wildcards:
+        for listener in wildcards:
             listener(event, model, *args)
             
         # Appelle les listeners spécifiques
-        if event in cls._listeners:
-            for listener in cls._listeners[event]:
-                listener(model, *args) 
\ No newline at end of file
+        for listener in listeners:
+            listener(model, *args)
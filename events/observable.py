@@ -1,4 +1,4 @@
-from typing import ClassVar, Dict, List, Callable, Any, Optional, Type
+from typing import ClassVar, Dict, List, Callable, Any, Optional, Tuple, Type
 from .dispatcher import EventDispatcher
 from .observer import Observer
 
@@ -15,14 +15,14 @@ class Observable:
                 send_welcome_email(self)
     """
     
-    # Événements par défaut
-    _events: ClassVar[List[str]] = [
+    # Événements par défaut (figés : une sous-classe les redéfinit au besoin)
+    _events: ClassVar[Tuple[str, ...]] = (
         'creating', 'created',
         'updating', 'updated',
         'deleting', 'deleted',
         'saving', 'saved',
         'restoring', 'restored'
-    ]
+    )
     
     # Observers de la classe
     _observers: ClassVar[List[Type[Observer]]] = []
@@ -33,6 +33,24 @@ class Observable:
         cls._observers.append(observer)
         observer.register(cls)
         
+    # Table propre à chaque classe, construite à la création de la classe :
+    # événement -> (nom dispatché, nom de la méthode on_*)
+    _event_names: ClassVar[Dict[str, Tuple[str, str]]]
+    
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._build_event_names()
+        
+    @classmethod
+    def _build_event_names(cls) -> Dict[str, Tuple[str, str]]:
+        """Précalcule les noms d'événements et méthodes on_* de la classe"""
+        cls._event_names = {event: cls._event_entry(event) for event in cls._events}
+        return cls._event_names
+        
+    @classmethod
+    def _event_entry(cls, event: str) -> Tuple[str, str]:
+        return f"{cls.__name__}.{event}", f'on_{event}'
+        
     def fire_event(self, event: str, *args) -> None:
         """
         Déclenche un événement.
@@ -41,14 +59,23 @@ class Observable:
             event: Nom de l'événement
             *args: Arguments supplémentaires
         """
-        # Appelle d'abord la méthode spécifique si elle existe
-        method = f'on_{event}'
-        if hasattr(self, method):
-            getattr(self, method)(*args)
+        cls = type(self)
+        names = cls.__dict__.get('_event_names')
+        if names is None:
+            # Observable lui-même, ou __init_subclass__ non chaîné par une base
+            names = cls._build_event_names()
+        entry = names.get(event)
+        if entry is None:
+            # Événement hors de _events (ex. associating) : ajouté à la volée
+            entry = names[event] = cls._event_entry(event)
+        name, method = entry
+        
+        # Appelle d'abord la méthode spécifique si elle existe : résolue à
+        # chaque appel, elle peut être ajoutée à la classe ou à l'instance
+        # après leur création
+        handler = getattr(self, method, None)
+        if handler is not None:
+            handler(*args)
             
         # Déclenche l'événement global
-        EventDispatcher.dispatch(
-            f"{self.__class__.__name__}.{event}",
-            self,
-            *args
-        ) 
\ No newline at end of file
+        EventDispatcher.dispatch(name, self, *args)
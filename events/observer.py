@@ -9,8 +9,7 @@ class Observer(ObserverInterface):
     def register(cls, model_class: Type[Any]) -> None:
         """Enregistre les méthodes de l'observer comme listeners"""
         for event in getattr(model_class, '_events', []):
-            if hasattr(cls, event):
-                EventDispatcher.listen(
-                    f"{model_class.__name__}.{event}",
-                    getattr(cls, event)
-                ) 
\ No newline at end of file
+            # Résolu une seule fois ici : le dispatch appelle directement le callable
+            listener = getattr(cls, event, None)
+            if listener is not None:
+                EventDispatcher.listen(f"{model_class.__name__}.{event}", listener) 
\ No newline at end of file
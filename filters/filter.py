@@ -2,11 +2,22 @@ from typing import Any, Dict, List, Optional, Union, Callable
 from dataclasses import dataclass, field
 
 from .interfaces import LogicalOperator
-from .operators import Operator
+from .operators import Operator, operator_value
 from .filter_condition import FilterCondition
 from .filter_group import FilterGroup
 
-@dataclass
+# Valeurs des opérateurs utilisées par les raccourcis where_*, lues une seule fois
+(
+    _OP_IN, _OP_NOT_IN, _OP_NULL, _OP_NOT_NULL,
+    _OP_BETWEEN, _OP_NOT_BETWEEN, _OP_LIKE, _OP_ILIKE
+) = (
+    op.value for op in (
+        Operator.IN, Operator.NOT_IN, Operator.NULL, Operator.NOT_NULL,
+        Operator.BETWEEN, Operator.NOT_BETWEEN, Operator.LIKE, Operator.ILIKE
+    )
+)
+
+@dataclass(slots=True)
 class Filter:
     """
     Classe principale pour construire et appliquer des filtres.
@@ -56,9 +67,7 @@ class Filter:
             filter.where('age', '>=', 18)
             filter.where('status', Operator.EQUAL, 'active')
         """
-        if isinstance(operator, Operator):
-            operator = operator.value
-            
+        operator = operator_value(operator)
         self.current_group.add_condition(field, operator, value)
         return self
     
@@ -87,45 +96,45 @@ class Filter:
             return self
             
         group = FilterGroup(LogicalOperator.OR)
-        group.add_condition(field_or_callback, operator, value)
+        group.add_condition(field_or_callback, operator_value(operator), value)
         self.root_group.add(group)
         return self
     
     def where_in(self, field: str, values: List[Any]) -> 'Filter':
         """Ajoute une condition WHERE IN."""
-        return self.where(field, Operator.IN, values)
+        return self.where(field, _OP_IN, values)
     
     def where_not_in(self, field: str, values: List[Any]) -> 'Filter':
         """Ajoute une condition WHERE NOT IN."""
-        return self.where(field, Operator.NOT_IN, values)
+        return self.where(field, _OP_NOT_IN, values)
     
     def where_null(self, field: str) -> 'Filter':
         """Ajoute une condition WHERE IS NULL."""
-        return self.where(field, Operator.NULL)
+        return self.where(field, _OP_NULL)
     
     def where_not_null(self, field: str) -> 'Filter':
         """Ajoute une condition WHERE IS NOT NULL."""
-        return self.where(field, Operator.NOT_NULL)
+        return self.where(field, _OP_NOT_NULL)
     
     def where_between(self, field: str, values: List[Any]) -> 'Filter':
         """Ajoute une condition WHERE BETWEEN."""
         if len(values) != 2:
             raise ValueError("La méthode where_between nécessite exactement 2 valeurs")
-        return self.where(field, Operator.BETWEEN, values)
+        return self.where(field, _OP_BETWEEN, values)
     
     def where_not_between(self, field: str, values: List[Any]) -> 'Filter':
         """Ajoute une condition WHERE NOT BETWEEN."""
         if len(values) != 2:
             raise ValueError("La méthode where_not_between nécessite exactement 2 valeurs")
-        return self.where(field, Operator.NOT_BETWEEN, values)
+        return self.where(field, _OP_NOT_BETWEEN, values)
     
     def where_like(self, field: str, pattern: str) -> 'Filter':
         """Ajoute une condition WHERE LIKE."""
-        return self.where(field, Operator.LIKE, pattern)
+        return self.where(field, _OP_LIKE, pattern)
     
     def where_ilike(self, field: str, pattern: str) -> 'Filter':
         """Ajoute une condition WHERE ILIKE (insensible à la casse)."""
-        return self.where(field, Operator.ILIKE, pattern)
+        return self.where(field, _OP_ILIKE, pattern)
     
     def group(self, callback: Callable[[FilterGroup], None]) -> 'Filter':
         """
@@ -1,10 +1,10 @@
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 from dataclasses import dataclass
 
 from .interfaces import FilterConditionInterface
 from .operators import Operator
 
-@dataclass
+@dataclass(slots=True)
 class FilterCondition(FilterConditionInterface):
     """
     Représente une condition de filtrage individuelle.
@@ -24,22 +24,38 @@ class FilterCondition(FilterConditionInterface):
     
     def __post_init__(self):
         """Validation après initialisation"""
+        self.operator, self.value = self.normalize(self.operator, self.value)
+        
+    @staticmethod
+    def normalize(operator: Any, value: Any) -> Tuple[str, Any]:
+        """
+        Valide un couple (opérateur, valeur) et le normalise.
+        
+        Example:
+            FilterCondition.normalize('>=', 18)    # ('>=', 18)
+            FilterCondition.normalize('active', None)  # ('=', 'active')
+        """
+        # L'opérateur n'est validé qu'une fois
+        valid = Operator.validate(operator)
+        
         # Si value n'est pas fourni et operator n'est pas un opérateur valide,
         # on considère que operator est en fait la valeur
-        if self.value is None and not Operator.validate(self.operator):
-            self.value = self.operator
-            self.operator = Operator.EQUAL.value
+        if value is None and not valid:
+            value = operator
+            operator = Operator.EQUAL.value
+            valid = True
             
-        # Maintenant on valide l'opérateur
-        if not Operator.validate(self.operator):
-            raise ValueError(f"Opérateur invalide: {self.operator}")
+        if not valid:
+            raise ValueError(f"Opérateur invalide: {operator}")
             
-        if Operator.requires_value(self.operator) and self.value is None:
-            raise ValueError(f"L'opérateur {self.operator} nécessite une valeur")
+        if Operator.requires_value(operator) and value is None:
+            raise ValueError(f"L'opérateur {operator} nécessite une valeur")
             
-        if Operator.requires_array(self.operator):
-            if not isinstance(self.value, (list, tuple)):
-                raise ValueError(f"L'opérateur {self.operator} nécessite un tableau de valeurs")
+        if Operator.requires_array(operator):
+            if not isinstance(value, (list, tuple)):
+                raise ValueError(f"L'opérateur {operator} nécessite un tableau de valeurs")
+                
+        return operator, value
                 
     def to_dict(self) -> Dict[str, Any]:
         """Convertit la condition en dictionnaire"""
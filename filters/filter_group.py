@@ -3,6 +3,17 @@ from typing import List, Union, Any, Dict
 from .interfaces import FilterGroupInterface, LogicalOperator
 from .filter_condition import FilterCondition
 
+# Valeur sérialisée -> membre de LogicalOperator, sans passer par Enum.__call__
+_LOGICAL_OPERATORS = {operator.value: operator for operator in LogicalOperator}
+
+
+def _logical_operator(value: str) -> LogicalOperator:
+    try:
+        return _LOGICAL_OPERATORS[value]
+    except KeyError:
+        # Lève la ValueError habituelle de l'enum
+        return LogicalOperator(value)
+
 class FilterGroup(FilterGroupInterface):
     """
     Groupe de conditions de filtrage.
@@ -19,6 +30,8 @@ class FilterGroup(FilterGroupInterface):
         group.add(subgroup)
     """
     
+    __slots__ = ('operator', 'conditions')
+    
     def __init__(self, operator: LogicalOperator = LogicalOperator.AND):
         self.operator = operator
         self.conditions: List[Union[FilterCondition, 'FilterGroup']] = []
@@ -51,21 +64,43 @@ class FilterGroup(FilterGroupInterface):
         return group
         
     def to_dict(self) -> Dict[str, Any]:
-        """Convertit le groupe en dictionnaire"""
-        return {
-            'operator': self.operator.value,
-            'conditions': [condition.to_dict() for condition in self.conditions]
-        }
+        """
+        Convertit le groupe en dictionnaire.
+        
+        Parcours itératif avec une pile explicite : les sous-groupes sont
+        remplis en place, sans un appel récursif par niveau d'imbrication.
+        """
+        result = {'operator': self.operator.value, 'conditions': []}
+        stack = [(self, result['conditions'])]
+        while stack:
+            group, output = stack.pop()
+            for condition in group.conditions:
+                if isinstance(condition, FilterGroup):
+                    child = {'operator': condition.operator.value, 'conditions': []}
+                    output.append(child)
+                    stack.append((condition, child['conditions']))
+                else:
+                    output.append(condition.to_dict())
+        return result
         
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'FilterGroup':
-        """Crée un groupe depuis un dictionnaire"""
-        group = cls(LogicalOperator(data['operator']))
+        """
+        Crée un groupe depuis un dictionnaire.
         
-        for condition_data in data['conditions']:
-            if 'operator' in condition_data:
-                group.add(cls.from_dict(condition_data))
-            else:
-                group.add(FilterCondition.from_dict(condition_data))
-                
-        return group 
\ No newline at end of file
+        Parcours itératif, symétrique de to_dict : un élément est un groupe
+        s'il porte une clé 'conditions' (une condition a aussi 'operator').
+        """
+        root = cls(_logical_operator(data['operator']))
+        stack = [(root, data['conditions'])]
+        while stack:
+            group, items = stack.pop()
+            for condition_data in items:
+                if 'conditions' in condition_data:
+                    child = cls(_logical_operator(condition_data['operator']))
+                    group.add(child)
+                    stack.append((child, condition_data['conditions']))
+                else:
+                    group.add(FilterCondition.from_dict(condition_data))
+                    
+        return root
@@ -14,6 +14,8 @@ ConditionType = TypeVar('ConditionType', bound='FilterConditionInterface')
 class FilterConditionInterface(ABC):
     """Interface pour les conditions de filtrage"""
     
+    __slots__ = ()
+    
     @abstractmethod
     def to_dict(self) -> Dict[str, Any]:
         pass
@@ -26,6 +28,8 @@ class FilterConditionInterface(ABC):
 class FilterGroupInterface(ABC):
     """Interface pour les groupes de conditions"""
     
+    __slots__ = ()
+    
     @abstractmethod
     def add(self, condition: Union[FilterConditionInterface, 'FilterGroupInterface']) -> 'FilterGroupInterface':
         pass
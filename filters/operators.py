@@ -48,7 +48,11 @@ class Operator(Enum):
             Operator.validate('=')  # True
             Operator.validate('INVALID')  # False
         """
-        return any(op.value == operator for op in cls)
+        try:
+            return operator in _OP_VALUES
+        except TypeError:
+            # Valeur non hashable passée en forme courte
+            return False
         
     @classmethod
     def requires_value(cls, operator: str) -> bool:
@@ -65,7 +69,7 @@ class Operator(Enum):
             Operator.requires_value('=')  # True
             Operator.requires_value('IS NULL')  # False
         """
-        return operator not in (cls.NULL.value, cls.NOT_NULL.value)
+        return operator not in _NO_VALUE_OPS
         
     @classmethod
     def requires_array(cls, operator: str) -> bool:
@@ -82,8 +86,7 @@ class Operator(Enum):
             Operator.requires_array('IN')  # True
             Operator.requires_array('=')  # False
         """
-        return operator in (cls.IN.value, cls.NOT_IN.value, 
-                          cls.BETWEEN.value, cls.NOT_BETWEEN.value)
+        return operator in _ARRAY_OPS
                           
     @classmethod
     def is_pattern_match(cls, operator: str) -> bool:
@@ -101,4 +104,31 @@ class Operator(Enum):
             Operator.is_pattern_match('ILIKE')  # True
             Operator.is_pattern_match('=')  # False
         """
-        return operator in (cls.LIKE.value, cls.ILIKE.value) 
\ No newline at end of file
+        return operator in _PATTERN_OPS
+
+
+# Tables précalculées au chargement du module : le chemin critique de where()
+# n'a plus besoin d'isinstance, d'accès .value sur l'enum ni de parcours linéaire
+_OP_VALUES = frozenset(operator.value for operator in Operator)
+_OP_TO_VAL = {operator: operator.value for operator in Operator}
+_NO_VALUE_OPS = frozenset({Operator.NULL.value, Operator.NOT_NULL.value})
+_ARRAY_OPS = frozenset({
+    Operator.IN.value, Operator.NOT_IN.value,
+    Operator.BETWEEN.value, Operator.NOT_BETWEEN.value
+})
+_PATTERN_OPS = frozenset({Operator.LIKE.value, Operator.ILIKE.value})
+
+
+def operator_value(operator: Any) -> Any:
+    """
+    Retourne la valeur d'un Operator, ou l'argument tel quel.
+    
+    Example:
+        operator_value(Operator.IN)  # 'IN'
+        operator_value('>=')  # '>='
+    """
+    try:
+        return _OP_TO_VAL.get(operator, operator)
+    except TypeError:
+        # Valeur non hashable passée en forme courte : where('tags', ['a'])
+        return operator
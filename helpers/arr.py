@@ -1,5 +1,6 @@
 from typing import Any, List, Dict, Callable, Optional, Union, TypeVar
 from copy import deepcopy
+from .collection import _OPS
 
 T = TypeVar('T')
 
@@ -62,7 +63,13 @@ class Arr:
             Arr.except(['a', 'b', 'c'], ['a'])  # ['b', 'c']
             Arr.except([1, 2, 3, 4], [1, 3])  # [2, 4]
         """
-        return [item for item in array if item not in keys]
+        try:
+            # Ensemble construit une fois : O(N + M) au lieu de O(N * M)
+            excluded = set(keys)
+            return [item for item in array if item not in excluded]
+        except TypeError:
+            # Éléments ou clés non hashables
+            return [item for item in array if item not in keys]
         
     @staticmethod
     def only(array: List[T], keys: List[Any]) -> List[T]:
@@ -73,7 +80,13 @@ class Arr:
             Arr.only(['a', 'b', 'c'], ['a', 'b'])  # ['a', 'b']
             Arr.only([1, 2, 3, 4], [2, 4])  # [2, 4]
         """
-        return [item for item in array if item in keys]
+        try:
+            # Ensemble construit une fois : O(N + M) au lieu de O(N * M)
+            kept = set(keys)
+            return [item for item in array if item in kept]
+        except TypeError:
+            # Éléments ou clés non hashables
+            return [item for item in array if item in keys]
         
     @staticmethod
     def pluck(array: List[Dict], key: str, value_key: Optional[str] = None) -> Union[List, Dict]:
@@ -102,28 +115,13 @@ class Arr:
             value = operator
             operator = '='
             
-        def compare(item_value: Any, op: str, compare_value: Any) -> bool:
-            if op == '=':
-                return item_value == compare_value
-            elif op == '!=':
-                return item_value != compare_value
-            elif op == '>':
-                return item_value > compare_value
-            elif op == '>=':
-                return item_value >= compare_value
-            elif op == '<':
-                return item_value < compare_value
-            elif op == '<=':
-                return item_value <= compare_value
-            elif op == 'in':
-                return item_value in compare_value
-            elif op == 'not in':
-                return item_value not in compare_value
-            return False
+        compare = _OPS.get(operator)
+        if compare is None:
+            return []
             
         return [
             item for item in array 
-            if key in item and compare(item[key], operator, value)
+            if key in item and compare(item[key], value)
         ]
         
     @staticmethod
@@ -171,7 +169,15 @@ class Arr:
         Example:
             Arr.unique([1, 2, 2, 3, 3, 3])  # [1, 2, 3]
         """
-        return list(dict.fromkeys(array))
+        try:
+            return list(dict.fromkeys(array))
+        except TypeError:
+            # Éléments non hashables (dict, list...) : comparaison par égalité
+            unique: List[T] = []
+            for item in array:
+                if item not in unique:
+                    unique.append(item)
+            return unique
         
     @staticmethod
     def chunk(array: List[T], size: int) -> List[List[T]]:
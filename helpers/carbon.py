@@ -1,6 +1,8 @@
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Union, Tuple
 
+_ONE_DAY = timedelta(days=1)
+
 class Carbon:
     """
     Helper pour la manipulation des dates.
@@ -38,8 +40,7 @@ class Carbon:
         Example:
             Carbon.today()  # 2024-01-20 00:00:00+00:00
         """
-        now = Carbon.now(tz)
-        return now.replace(hour=0, minute=0, second=0, microsecond=0)
+        return datetime.now(tz or timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
     
     @staticmethod
     def tomorrow(tz: Optional[timezone] = None) -> datetime:
@@ -49,7 +50,7 @@ class Carbon:
         Example:
             Carbon.tomorrow()  # 2024-01-21 00:00:00+00:00
         """
-        return Carbon.today(tz) + timedelta(days=1)
+        return Carbon.today(tz) + _ONE_DAY
     
     @staticmethod
     def yesterday(tz: Optional[timezone] = None) -> datetime:
@@ -59,7 +60,7 @@ class Carbon:
         Example:
             Carbon.yesterday()  # 2024-01-19 00:00:00+00:00
         """
-        return Carbon.today(tz) - timedelta(days=1)
+        return Carbon.today(tz) - _ONE_DAY
     
     @staticmethod
     def parse(value: Union[str, datetime], format: Optional[str] = None) -> datetime:
@@ -89,26 +90,37 @@ class Carbon:
         return date.strftime(format)
     
     @staticmethod
-    def is_future(date: datetime) -> bool:
+    def is_future(date: datetime, now: Optional[datetime] = None) -> bool:
         """
         Vérifie si une date est dans le futur.
         
+        Args:
+            date: Date à vérifier
+            now: Instant de référence, à réutiliser entre plusieurs appels
+            
         Example:
             Carbon.is_future(Carbon.tomorrow())  # True
             Carbon.is_future(Carbon.yesterday())  # False
+            
+            now = Carbon.now()
+            Carbon.is_past(start, now) and Carbon.is_future(end, now)
         """
-        return date > Carbon.now(date.tzinfo)
+        return date > (now or datetime.now(date.tzinfo or timezone.utc))
     
     @staticmethod
-    def is_past(date: datetime) -> bool:
+    def is_past(date: datetime, now: Optional[datetime] = None) -> bool:
         """
         Vérifie si une date est dans le passé.
         
+        Args:
+            date: Date à vérifier
+            now: Instant de référence, à réutiliser entre plusieurs appels
+            
         Example:
             Carbon.is_past(Carbon.yesterday())  # True
             Carbon.is_past(Carbon.tomorrow())  # False
         """
-        return date < Carbon.now(date.tzinfo)
+        return date < (now or datetime.now(date.tzinfo or timezone.utc))
     
     @staticmethod
     def diff_for_humans(
@@ -1,9 +1,27 @@
 from typing import Any, Dict, List, Optional, Callable, Union, TypeVar, Iterator
 from functools import reduce
+from math import fsum
+from operator import eq, ne, gt, ge, lt, le, attrgetter, itemgetter
 from .interfaces import CollectionInterface
 
 T = TypeVar('T')
 
+# Table de dispatch des opérateurs de where(), construite une seule fois
+# (fonctions C du module operator pour les comparaisons)
+_OPS: Dict[str, Callable[[Any, Any], bool]] = {
+    '=': eq,
+    '!=': ne,
+    '>': gt,
+    '>=': ge,
+    '<': lt,
+    '<=': le,
+    'in': lambda a, b: a in b,
+    'not in': lambda a, b: a not in b,
+}
+
+# Sentinelle de _get_value : distingue un attribut absent d'un attribut à None
+_MISSING = object()
+
 class Collection(CollectionInterface[T], list):
     """
     Collection améliorée avec des méthodes inspirées de Laravel.
@@ -48,13 +66,15 @@ class Collection(CollectionInterface[T], list):
             avg_age = users.avg('age')
             avg_score = scores.avg()  # Si les éléments sont des nombres
         """
-        if not self:
+        count = len(self)
+        if not count:
             return 0.0
             
+        # fsum : somme exacte, map(float) garde la conversion côté C
         if key is None:
-            return sum(float(item) for item in self) / len(self)
+            return fsum(map(float, self)) / count
             
-        return sum(float(self._get_value(item, key)) for item in self) / len(self)
+        return fsum(map(float, map(self._accessor(key), self))) / count
         
     def chunk(self, size: int) -> 'Collection[Collection[T]]':
         """
@@ -83,7 +103,8 @@ class Collection(CollectionInterface[T], list):
         if callable(key):
             return any(key(item) for item in self)
             
-        return any(self._get_value(item, key) == value for item in self)
+        get = self._accessor(key)
+        return any(get(item) == value for item in self)
         
     def count(self) -> int:
         """Compte les éléments"""
@@ -131,14 +152,15 @@ class Collection(CollectionInterface[T], list):
             by_age_group = users.group_by(lambda u: u.age // 10 * 10)
         """
         groups: Dict[Any, Collection[T]] = {}
+        get = key if callable(key) else self._accessor(key)
         
         for item in self:
-            group_key = key(item) if callable(key) else self._get_value(item, key)
-            
-            if group_key not in groups:
-                groups[group_key] = Collection()
-                
-            groups[group_key].append(item)
+            group_key = get(item)
+            # Un seul hachage de la clé pour un groupe existant
+            group = groups.get(group_key)
+            if group is None:
+                group = groups[group_key] = Collection()
+            group.append(item)
             
         return groups
         
@@ -159,13 +181,12 @@ class Collection(CollectionInterface[T], list):
             names = users.pluck('name')
             id_name_map = users.pluck('name', 'id')  # {1: 'John', 2: 'Jane'}
         """
+        get = self._accessor(key)
         if value_key is None:
-            return Collection(self._get_value(item, key) for item in self)
+            return Collection(get(item) for item in self)
             
-        return {
-            self._get_value(item, value_key): self._get_value(item, key)
-            for item in self
-        }
+        get_key = self._accessor(value_key)
+        return {get_key(item): get(item) for item in self}
         
     def where(self, key: str, operator: str, value: Any) -> 'Collection[T]':
         """
@@ -175,29 +196,35 @@ class Collection(CollectionInterface[T], list):
             adults = users.where('age', '>=', 18)
             active = users.where('status', '=', 'active')
         """
-        ops = {
-            '=': lambda a, b: a == b,
-            '!=': lambda a, b: a != b,
-            '>': lambda a, b: a > b,
-            '>=': lambda a, b: a >= b,
-            '<': lambda a, b: a < b,
-            '<=': lambda a, b: a <= b,
-            'in': lambda a, b: a in b,
-            'not in': lambda a, b: a not in b,
-        }
-        
-        if operator not in ops:
+        compare = _OPS.get(operator)
+        if compare is None:
             raise ValueError(f"Opérateur non supporté: {operator}")
             
-        return Collection(
-            item for item in self
-            if ops[operator](self._get_value(item, key), value)
-        )
+        get = self._accessor(key)
+        return Collection(item for item in self if compare(get(item), value))
+        
+    def _accessor(self, key: str) -> Callable[[T], Any]:
+        """
+        Choisit une fois, d'après le type des éléments, la fonction d'accès à
+        une clé : itemgetter pour des dict, attrgetter pour des objets d'une
+        même classe, _get_value pour une collection hétérogène.
+        """
+        if self:
+            first = self[0]
+            item_type = type(first)
+            if all(type(item) is item_type for item in self):
+                if item_type is dict:
+                    return itemgetter(key)
+                if hasattr(first, key):
+                    return attrgetter(key)
+        return lambda item: self._get_value(item, key)
         
     def _get_value(self, item: T, key: str) -> Any:
         """Récupère une valeur par sa clé"""
-        if hasattr(item, key):
-            return getattr(item, key)
+        # Un seul accès à l'attribut (au lieu de hasattr puis getattr)
+        value = getattr(item, key, _MISSING)
+        if value is not _MISSING:
+            return value
         if hasattr(item, '__getitem__'):
             return item[key]
         raise ValueError(f"Impossible d'accéder à la clé {key}") 
@@ -55,6 +55,7 @@ class Model(Base, Observable):
     _primary_key: ClassVar[str] = 'id'
     _timestamps: ClassVar[bool] = True
     _soft_deletes: ClassVar[bool] = False
+    DELETED_AT_COLUMN: ClassVar[str] = 'deleted_at'
     
     # Attribute casting
     _casts: ClassVar[Dict[str, str]] = {}
@@ -202,7 +203,7 @@ class Model(Base, Observable):
         session = self.get_session()
         try:
             if self._soft_deletes:
-                self.deleted_at = datetime.now()
+                setattr(self, self.DELETED_AT_COLUMN, datetime.now())
                 session.add(self)
                 session.commit()
             else:
@@ -362,7 +363,7 @@ class Model(Base, Observable):
         if key in self._casts:
             cast_class = CastRegistry.get(self._casts[key])
             if isinstance(cast_class, type) and issubclass(cast_class, Cast):
-                value = cast_class().to_database(value)
+                value = CastRegistry.instance(self._casts[key]).to_database(value)
         super().__setattr__(key, value)
 
     @classmethod
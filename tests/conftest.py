@@ -0,0 +1,130 @@
+"""
+Shared fixtures for the test suite.
+
+The package imports itself as `libs.pyloquent`: it is registered under that
+name from the repository root, so the tests run from a plain checkout.
+"""
+
+import importlib.util
+import sys
+from datetime import datetime
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+if 'libs.pyloquent' not in sys.modules:
+    libs = sys.modules.setdefault('libs', ModuleType('libs'))
+    libs.__path__ = []
+    spec = importlib.util.spec_from_file_location(
+        'libs.pyloquent', ROOT / '__init__.py', submodule_search_locations=[str(ROOT)]
+    )
+    package = importlib.util.module_from_spec(spec)
+    sys.modules['libs.pyloquent'] = package
+    spec.loader.exec_module(package)
+    libs.pyloquent = package
+
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy.orm import relationship
+
+from libs.pyloquent import Model
+from libs.pyloquent.scopes import GlobalScope
+
+
+class Author(Model):
+    __tablename__ = 'authors'
+    
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    books = relationship('Book')
+
+
+class Book(Model):
+    __tablename__ = 'books'
+    
+    id = Column(Integer, primary_key=True)
+    author_id = Column(ForeignKey('authors.id'))
+    title = Column(String)
+
+
+class Tag(Model):
+    __tablename__ = 'tags'
+    
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+
+
+class BookTag(Model):
+    __tablename__ = 'book_tag'
+    
+    book_id = Column(ForeignKey('books.id'), primary_key=True)
+    tag_id = Column(ForeignKey('tags.id'), primary_key=True)
+    position = Column(Integer)
+
+
+class Post(Model):
+    __tablename__ = 'posts'
+    _soft_deletes = True
+    
+    id = Column(Integer, primary_key=True)
+    title = Column(String)
+    views = Column(Integer)
+    deleted_at = Column(DateTime)
+
+
+class PublishedScope(GlobalScope):
+    def apply(self, builder):
+        return builder.where('published', True)
+
+
+class Page(Model):
+    __tablename__ = 'pages'
+    _global_scopes = [PublishedScope]
+    
+    id = Column(Integer, primary_key=True)
+    published = Column(Boolean)
+
+
+@pytest.fixture
+def db():
+    """
+    In-memory SQLite database seeded with two authors, their books and tags,
+    posts (one of them soft-deleted) and pages (one of them unpublished).
+    """
+    Model.set_connection('sqlite://')
+    Model.metadata.create_all(Model._connection)
+    session = Model.get_session()
+    session.execute(Author.__table__.insert(), [
+        {'id': 1, 'name': 'Ada'},
+        {'id': 2, 'name': 'Grace'},
+    ])
+    session.execute(Book.__table__.insert(), [
+        {'author_id': 1, 'title': 'Notes'},
+        {'author_id': 1, 'title': 'Sketch'},
+        {'author_id': 2, 'title': 'Compilers'},
+    ])
+    session.execute(Tag.__table__.insert(), [
+        {'id': 1, 'name': 'math'},
+        {'id': 2, 'name': 'history'},
+        {'id': 3, 'name': 'code'},
+    ])
+    session.execute(BookTag.__table__.insert(), [
+        {'book_id': 1, 'tag_id': 1, 'position': 2},
+        {'book_id': 1, 'tag_id': 2, 'position': 1},
+        {'book_id': 3, 'tag_id': 3, 'position': 1},
+    ])
+    session.execute(Post.__table__.insert(), [
+        {'id': 1, 'title': 'Draft', 'views': 10, 'deleted_at': None},
+        {'id': 2, 'title': 'Launch', 'views': 500, 'deleted_at': None},
+        {'id': 3, 'title': 'Old', 'views': 50, 'deleted_at': datetime(2024, 1, 1)},
+    ])
+    session.execute(Page.__table__.insert(), [
+        {'id': 1, 'published': True},
+        {'id': 2, 'published': False},
+    ])
+    session.commit()
+    yield session
+    Model._session.remove()
+    Model._connection.dispose()
@@ -0,0 +1,122 @@
+import pytest
+from sqlalchemy import event
+
+from conftest import Author, Book
+from libs.pyloquent.builder.aggregate_builder import AggregateBuilder, MemoryCache, _order_expression
+from libs.pyloquent.exceptions import InvalidQueryException
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(AggregateBuilder, 'cache_store', MemoryCache())
+
+
+def test_cached_result_is_not_shared_with_callers(db):
+    first = Book.aggregate().where('author_id', 1).count('id', 'books').get(cache=True)
+    first['books'] = 999
+    
+    second = Book.aggregate().where('author_id', 1).count('id', 'books').get(cache=True)
+    
+    assert second == {'books': 2}
+
+
+def test_cache_key_depends_on_bound_values(db):
+    ada = Book.aggregate().where('author_id', 1).count('id', 'books').get(cache=True)
+    grace = Book.aggregate().where('author_id', 2).count('id', 'books').get(cache=True)
+    
+    assert (ada, grace) == ({'books': 2}, {'books': 1})
+
+
+def test_batch_groups_same_shape_builders_in_one_query(db):
+    statements = []
+    event.listen(db.get_bind(), 'before_cursor_execute', lambda *args: statements.append(args[2]))
+    
+    results = AggregateBuilder.batch([
+        Book.aggregate().where('author_id', author_id).count('id', 'books').max('title', 'last')
+        for author_id in (1, 2, 3, 1)
+    ])
+    
+    assert results == [
+        {'books': 2, 'last': 'Sketch'},
+        {'books': 1, 'last': 'Compilers'},
+        {'books': 0, 'last': None},
+        {'books': 2, 'last': 'Sketch'},
+    ]
+    assert len(statements) == 1
+    assert 'GROUP BY' in statements[0] and 'UNION' not in statements[0]
+
+
+def test_batch_keeps_union_for_heterogeneous_shapes(db):
+    books, authors = AggregateBuilder.batch([
+        Book.aggregate().where('author_id', 1).count('id', 'books'),
+        Author.aggregate().count('id', 'authors'),
+    ])
+    
+    assert (books, authors) == ({'books': 2}, {'authors': 2})
+
+
+@pytest.mark.parametrize('configure', [
+    lambda q: q.select('author_id').group_by('author_id'),
+    lambda q: q.order_by('books', 'desc'),
+])
+def test_batch_rejects_grouped_or_ordered_builders(db, configure):
+    builder = configure(Book.aggregate().count('id', 'books'))
+    
+    with pytest.raises(InvalidQueryException):
+        AggregateBuilder.batch([builder, Author.aggregate().count('id', 'authors')])
+        
+    with pytest.raises(InvalidQueryException):
+        with AggregateBuilder.scoped_batch():
+            builder.get()
+
+
+def test_frozen_plan_params_are_read_only_copies(db):
+    plan = Book.aggregate().where('author_id', 1).count('id', 'books').freeze()
+    
+    with pytest.raises(TypeError):
+        plan.params['w0'] = 2
+        
+    assert plan.get() == {'books': 2}
+    assert plan.get(w0=2) == {'books': 1}
+
+
+def test_cache_key_of_ordered_aggregate_is_stable(db):
+    def key():
+        builder = Book.aggregate().select('author_id').count('id', 'books')\
+            .group_by('author_id').order_by('books', 'desc')
+        return builder._cache_key(builder._build_params())
+        
+    first = key()
+    _order_expression.cache_clear()
+    
+    assert key() == first
+    assert ' at 0x' not in repr(Book.aggregate().order_by('title')._shape_key())
+
+
+def test_memory_cache_is_bounded():
+    cache = MemoryCache(maxsize=4)
+    cache.set('expired', 0, timeout=-1)
+    for i in range(10):
+        cache.set(f"k{i}", i)
+        
+    assert len(cache._entries) <= 4
+    assert cache.get('expired') is None
+    assert cache.get('k9') == 9
+
+
+@pytest.mark.parametrize('configure', [
+    lambda q: q.where('author_id', 99).select('author_id').group_by('author_id'),
+    lambda q: q.having('books', '>', 10),
+])
+def test_empty_result_is_none_in_every_path(db, configure):
+    def builder():
+        return configure(Book.aggregate().count('id', 'books'))
+        
+    assert builder().get() is None
+    assert builder().get(cache=True) is None
+    assert builder().freeze().get() is None
+    if not builder()._groups:
+        assert AggregateBuilder.batch([builder(), Author.aggregate().count('id', 'authors')])[0] is None
+        with AggregateBuilder.scoped_batch():
+            future = builder().get()
+        assert future.result() is None
@@ -0,0 +1,26 @@
+from libs.pyloquent.helpers import Arr
+
+
+def test_where_uses_the_shared_operator_table():
+    items = [{'id': 1, 'views': 10}, {'id': 2, 'views': 50}, {'id': 3}]
+    
+    assert Arr.where(items, 'views', '>=', 50) == [{'id': 2, 'views': 50}]
+    assert Arr.where(items, 'id', 3) == [{'id': 3}]
+    assert Arr.where(items, 'views', '<>', 10) == []
+
+
+def test_except_and_only_with_hashable_items():
+    assert Arr.except_([1, 2, 3, 4], [1, 3]) == [2, 4]
+    assert Arr.only(['a', 'b', 'c', 'a'], ('a', 'c')) == ['a', 'c', 'a']
+
+
+def test_except_and_only_fall_back_for_unhashable_items():
+    items = [{'id': 1}, {'id': 2}, [3]]
+    
+    assert Arr.except_(items, [{'id': 1}]) == [{'id': 2}, [3]]
+    assert Arr.only(items, [[3]]) == [[3]]
+
+
+def test_unique_keeps_order_and_accepts_unhashable_items():
+    assert Arr.unique([3, 1, 3, 2, 1]) == [3, 1, 2]
+    assert Arr.unique([{'a': 1}, {'a': 1}, [2]]) == [{'a': 1}, [2]]
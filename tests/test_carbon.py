@@ -0,0 +1,33 @@
+from datetime import datetime, timedelta, timezone
+
+from libs.pyloquent.helpers.carbon import Carbon
+
+
+def test_today_is_midnight_utc():
+    today = Carbon.today()
+    
+    assert today.tzinfo is timezone.utc
+    assert (today.hour, today.minute, today.second, today.microsecond) == (0, 0, 0, 0)
+
+
+def test_tomorrow_and_yesterday_are_one_day_from_today():
+    today = Carbon.today()
+    
+    assert Carbon.tomorrow() - today == timedelta(days=1)
+    assert today - Carbon.yesterday() == timedelta(days=1)
+
+
+def test_is_future_and_is_past():
+    assert Carbon.is_future(Carbon.tomorrow())
+    assert not Carbon.is_future(Carbon.yesterday())
+    assert Carbon.is_past(Carbon.yesterday())
+    assert not Carbon.is_past(Carbon.tomorrow())
+
+
+def test_is_future_and_is_past_use_the_given_now():
+    now = datetime(2024, 1, 20, 12, tzinfo=timezone.utc)
+    start = datetime(2024, 1, 19, tzinfo=timezone.utc)
+    end = datetime(2024, 1, 21, tzinfo=timezone.utc)
+    
+    assert Carbon.is_past(start, now) and Carbon.is_future(end, now)
+    assert not Carbon.is_future(now, now) and not Carbon.is_past(now, now)
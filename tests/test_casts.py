@@ -0,0 +1,117 @@
+import importlib
+import math
+import sys
+from datetime import date, datetime
+
+import pytest
+
+from libs.pyloquent.casts import json_cast
+from libs.pyloquent.casts.datetime_cast import DateTimeCast
+from libs.pyloquent.casts.interfaces import CastInterface
+from libs.pyloquent.casts.registry import CastRegistry
+
+
+@pytest.mark.parametrize('value', [
+    '2024-02-30T00:00:00',
+    '2024-01-01T00:00:00\n',
+    '２０２４-01-01T00:00:00',
+])
+def test_datetime_rejects_invalid_canonical_looking_strings(value):
+    assert DateTimeCast().to_database(value) is None
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('2024-01-01T10:30:00', '2024-01-01T10:30:00'),
+    ('2024-01-01T10:30:00.123456+02:00', '2024-01-01T10:30:00.123456+02:00'),
+    ('2024-01-01 10:30:00', '2024-01-01T10:30:00'),
+    (datetime(2024, 1, 1, 10, 30), '2024-01-01T10:30:00'),
+])
+def test_datetime_to_database(value, expected):
+    assert DateTimeCast().to_database(value) == expected
+
+
+@pytest.fixture(params=['orjson', 'json'])
+def json_module(request, monkeypatch):
+    """Module json_cast rechargé avec puis sans orjson."""
+    if request.param == 'orjson':
+        pytest.importorskip('orjson')
+    else:
+        monkeypatch.setitem(sys.modules, 'orjson', None)
+    yield importlib.reload(json_cast)
+    monkeypatch.undo()
+    importlib.reload(json_cast)
+
+
+def test_json_format_does_not_depend_on_orjson(json_module):
+    value = {'name': 'Zoé', 'tags': [1, 2.5, None]}
+    
+    assert json_module.JsonCast().to_database(value) == '{"name": "Zo\\u00e9", "tags": [1, 2.5, null]}'
+
+
+@pytest.mark.parametrize('value', [
+    {'big': 123456789012345678901234567890, 'negative': -98765432109876543210},
+    {'ratio': float('inf'), 'low': float('-inf')},
+])
+def test_json_round_trip(json_module, value):
+    cast = json_module.JsonCast()
+    
+    assert cast.to_python(cast.to_database(value)) == value
+
+
+def test_json_reads_nan_written_by_json(json_module):
+    cast = json_module.JsonCast()
+    stored = '{"ratio": NaN}'
+    
+    assert math.isnan(cast.to_python(stored)['ratio'])
+    assert cast.to_database(stored) == stored
+
+
+def test_json_encodes_dates_as_iso_strings(json_module):
+    cast = json_module.JsonCast()
+    stored = cast.to_database({'at': datetime(2024, 1, 1, 10, 30), 'on': date(2024, 1, 2)})
+    
+    assert stored == '{"at": "2024-01-01T10:30:00", "on": "2024-01-02"}'
+    assert cast.to_python(stored) == {'at': '2024-01-01T10:30:00', 'on': '2024-01-02'}
+    with pytest.raises(TypeError):
+        cast.to_database({'value': object()})
+
+
+def test_cast_instances_are_shared():
+    assert CastRegistry.instance('json') is CastRegistry.instance('json')
+    assert CastRegistry.resolver('int') is CastRegistry.resolver('int')
+
+
+def test_primitive_casts_are_memoized_by_value_and_type():
+    CastRegistry._cached.cache_clear()
+    
+    assert CastRegistry.cast('12', 'int') == 12
+    assert CastRegistry.cast('12', 'int') == 12
+    assert (CastRegistry.cast(1, 'str'), CastRegistry.cast(True, 'str')) == ('1', 'True')
+    assert CastRegistry._cached.cache_info().hits == 1
+
+
+def test_json_cast_results_are_not_shared():
+    first = CastRegistry.cast('{"a": 1}', 'json')
+    first['a'] = 2
+    
+    assert CastRegistry.cast('{"a": 1}', 'json') == {'a': 1}
+
+
+def test_register_replaces_the_instance_and_disables_memoization(monkeypatch):
+    class UpperCast(CastInterface):
+        def to_python(self, value):
+            return value.upper()
+            
+        def to_database(self, value):
+            return value
+            
+    monkeypatch.setattr(CastRegistry, '_casts', dict(CastRegistry._casts))
+    monkeypatch.setattr(CastRegistry, '_instances', dict(CastRegistry._instances))
+    monkeypatch.setattr(CastRegistry, '_resolvers', dict(CastRegistry._resolvers))
+    monkeypatch.setattr(CastRegistry, '_cacheable', set(CastRegistry._cacheable))
+    
+    CastRegistry.register('str', UpperCast)
+    
+    assert CastRegistry.cast('abc', 'str') == 'ABC'
+    assert 'str' not in CastRegistry._cacheable
+    assert isinstance(CastRegistry.instance('str'), UpperCast)
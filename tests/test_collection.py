@@ -0,0 +1,84 @@
+import pytest
+
+from libs.pyloquent.helpers import Collection
+
+
+class User:
+    def __init__(self, name, age, role=None):
+        self.name = name
+        self.age = age
+        self.role = role
+
+
+def users():
+    return Collection([User('John', 25, 'admin'), User('Jane', 30), User('Bob', 17, 'admin')])
+
+
+def test_get_value_reads_attributes_once_and_falls_back_to_items():
+    collection = Collection()
+    
+    assert collection._get_value(User('John', 25), 'role') is None
+    assert collection._get_value({'role': 'admin'}, 'role') == 'admin'
+    with pytest.raises(ValueError):
+        collection._get_value(42, 'role')
+
+
+def test_where_and_contains_handle_attributes_set_to_none():
+    assert users().where('role', '=', None).pluck('name') == ['Jane']
+    assert users().contains('role', None)
+
+
+@pytest.mark.parametrize('operator, value, names', [
+    ('=', 25, ['John']),
+    ('!=', 25, ['Jane', 'Bob']),
+    ('>', 25, ['Jane']),
+    ('>=', 25, ['John', 'Jane']),
+    ('<', 25, ['Bob']),
+    ('<=', 25, ['John', 'Bob']),
+    ('in', (17, 30), ['Jane', 'Bob']),
+    ('not in', (17, 30), ['John']),
+])
+def test_where_operators(operator, value, names):
+    assert users().where('age', operator, value).pluck('name') == names
+
+
+def test_where_rejects_an_unknown_operator():
+    with pytest.raises(ValueError):
+        users().where('age', '<>', 25)
+
+
+def test_accessor_reads_dict_keys_before_dict_attributes():
+    rows = Collection([{'values': 1, 'id': 1}, {'values': 2, 'id': 2}])
+    
+    assert rows.pluck('values') == [1, 2]
+    assert rows.pluck('values', 'id') == {1: 1, 2: 2}
+
+
+def test_accessor_handles_mixed_collections():
+    class Admin(User):
+        pass
+        
+    mixed = Collection([User('John', 25), Admin('Jane', 30), {'name': 'Bob', 'age': 17}])
+    
+    assert mixed.pluck('name') == ['John', 'Jane', 'Bob']
+    assert mixed.where('age', '>', 20).pluck('name') == ['John', 'Jane']
+    assert list(mixed.group_by('age')) == [25, 30, 17]
+    assert mixed.contains('name', 'Bob')
+    assert Collection().pluck('name') == []
+
+
+def test_avg_is_exact_and_reads_numeric_strings():
+    assert Collection([0.1] * 10).avg() == 0.1
+    assert Collection(['1', 2, 3.0]).avg() == 2.0
+    assert users().avg('age') == 24.0
+    assert Collection().avg('age') == 0.0
+
+
+def test_group_by_returns_collections_in_first_seen_order():
+    groups = users().group_by('role')
+    
+    assert type(groups) is dict
+    assert list(groups) == ['admin', None]
+    assert all(isinstance(group, Collection) for group in groups.values())
+    assert groups['admin'].pluck('name') == ['John', 'Bob']
+    assert users().group_by(lambda user: user.age >= 18)[False].pluck('name') == ['Bob']
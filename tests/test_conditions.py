@@ -0,0 +1,13 @@
+from libs.pyloquent.builder.conditions import selectivity_order
+
+
+def test_selectivity_order_puts_equality_first_and_like_last():
+    assert selectivity_order(('LIKE', '>', '=', 'IN')) == (2, 3, 1, 0)
+
+
+def test_selectivity_order_is_stable():
+    assert selectivity_order(('>', '=', '<', '=')) == (1, 3, 0, 2)
+
+
+def test_selectivity_order_keeps_the_order_with_an_unknown_operator():
+    assert selectivity_order(('LIKE', '@>', '=')) == (0, 1, 2)
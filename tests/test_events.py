@@ -0,0 +1,74 @@
+import pytest
+
+from libs.pyloquent.events.dispatcher import EventDispatcher
+from libs.pyloquent.events.observable import Observable
+
+
+class Article(Observable):
+    def __init__(self):
+        self.calls = []
+        
+    def on_created(self):
+        self.calls.append('class')
+
+
+def test_fire_event_calls_the_class_handler():
+    article = Article()
+    
+    article.fire_event('created')
+    
+    assert article.calls == ['class']
+
+
+def test_fire_event_calls_a_handler_attached_to_the_instance():
+    article, other = Article(), Article()
+    article.on_saved = lambda: article.calls.append('instance')
+    
+    article.fire_event('saved')
+    other.fire_event('saved')
+    
+    assert (article.calls, other.calls) == (['instance'], [])
+
+
+@pytest.fixture
+def dispatcher():
+    yield EventDispatcher
+    EventDispatcher.flush()
+
+
+def test_dispatch_sees_listeners_registered_after_a_dispatch(dispatcher):
+    calls = []
+    dispatcher.dispatch('Article.created', None)
+    dispatcher.listen('Article.created', lambda model: calls.append('listener'))
+    dispatcher.listen_any(lambda event, model: calls.append(event))
+    
+    dispatcher.dispatch('Article.created', None)
+    
+    assert calls == ['Article.created', 'listener']
+
+
+def test_forget_and_flush_invalidate_resolved_listeners(dispatcher):
+    calls = []
+    dispatcher.listen('Article.created', lambda model: calls.append('listener'))
+    dispatcher.dispatch('Article.created', None)
+    
+    dispatcher.forget('Article.created')
+    dispatcher.dispatch('Article.created', None)
+    dispatcher.listen_any(lambda event, model: calls.append(event))
+    dispatcher.flush()
+    dispatcher.dispatch('Article.created', None)
+    
+    assert calls == ['listener']
+
+
+def test_fire_event_calls_a_handler_added_to_the_class_later():
+    class Draft(Observable):
+        pass
+        
+    calls = []
+    Draft.on_created = lambda self: calls.append(self)
+    draft = Draft()
+    
+    draft.fire_event('created')
+    
+    assert calls == [draft]
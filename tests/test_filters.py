@@ -0,0 +1,102 @@
+import pytest
+
+from libs.pyloquent.filters import FilterCondition, FilterGroup, LogicalOperator, Operator
+
+
+@pytest.mark.parametrize('operator, valid', [
+    ('=', True),
+    ('NOT BETWEEN', True),
+    ('like', False),
+    ('INVALID', False),
+    (['not', 'hashable'], False),
+])
+def test_operator_validate(operator, valid):
+    assert Operator.validate(operator) is valid
+
+
+def test_operator_predicates():
+    assert not Operator.requires_value('IS NULL')
+    assert Operator.requires_value('=')
+    assert Operator.requires_array('BETWEEN') and not Operator.requires_array('=')
+    assert Operator.is_pattern_match('ILIKE') and not Operator.is_pattern_match('IN')
+
+
+def test_filter_condition_short_form():
+    condition = FilterCondition('status', 'active')
+    
+    assert (condition.field, condition.operator, condition.value) == ('status', '=', 'active')
+    assert FilterCondition('tags', ['a', 'b']).value == ['a', 'b']
+
+
+def test_filter_condition_has_slots():
+    assert not hasattr(FilterCondition('age', '>=', 18), '__dict__')
+
+
+@pytest.mark.parametrize('operator, value', [
+    ('=', None),
+    ('IN', 'active'),
+    ('BETWEEN', 3),
+])
+def test_filter_condition_rejects_invalid_values(operator, value):
+    with pytest.raises(ValueError):
+        FilterCondition('status', operator, value)
+
+
+def test_filter_condition_validates_the_operator_once(monkeypatch):
+    calls = []
+    validate = Operator.validate
+    monkeypatch.setattr(Operator, 'validate', lambda operator: calls.append(operator) or validate(operator))
+    
+    FilterCondition('status', 'active')
+    
+    assert calls == ['active']
+
+
+def test_to_dict_reflects_later_changes():
+    group = FilterGroup()
+    group.add_condition('age', '>=', 18)
+    before = group.to_dict()
+    
+    group.add_group(LogicalOperator.OR).add_condition('role', '=', 'admin')
+    
+    assert before == {'operator': 'AND', 'conditions': [{'field': 'age', 'operator': '>=', 'value': 18}]}
+    assert group.to_dict()['conditions'][1] == {
+        'operator': 'OR',
+        'conditions': [{'field': 'role', 'operator': '=', 'value': 'admin'}],
+    }
+    assert group.to_dict() is not group.to_dict()
+
+
+def test_from_dict_round_trips_nested_groups():
+    data = {'operator': 'AND', 'conditions': [
+        {'field': 'age', 'operator': '>=', 'value': 18},
+        {'operator': 'OR', 'conditions': [
+            {'field': 'role', 'operator': '=', 'value': 'admin'},
+            {'operator': 'AND', 'conditions': [{'field': 'deleted_at', 'operator': 'IS NULL', 'value': None}]},
+        ]},
+        {'field': 'status', 'operator': 'IN', 'value': ['active']},
+    ]}
+    
+    assert FilterGroup.from_dict(data).to_dict() == data
+
+
+def test_from_dict_handles_deep_nesting():
+    data = {'field': 'id', 'operator': '=', 'value': 1}
+    for _ in range(5000):
+        data = {'operator': 'AND', 'conditions': [data]}
+        
+    group = FilterGroup.from_dict(data)
+    depth = 0
+    while isinstance(group, FilterGroup):
+        group, depth = group.conditions[0], depth + 1
+        
+    assert depth == 5000
+    assert (group.field, group.value) == ('id', 1)
+
+
+def test_from_dict_maps_logical_operators_to_members():
+    group = FilterGroup.from_dict({'operator': 'OR', 'conditions': []})
+    
+    assert group.operator is LogicalOperator.OR
+    with pytest.raises(ValueError):
+        FilterGroup.from_dict({'operator': 'XOR', 'conditions': []})
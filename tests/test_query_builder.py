@@ -0,0 +1,212 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event
+
+from conftest import Author, Book, Page, Post
+from libs.pyloquent.builder import query_builder
+from libs.pyloquent.exceptions import InvalidQueryException
+
+
+def test_iter_get_with_joined_collection_falls_back_to_buffered_get(db):
+    authors = list(Author.query().with_joined('books').order_by('id').iter_get(batch=1))
+    
+    assert [author.name for author in authors] == ['Ada', 'Grace']
+    assert [len(author.books) for author in authors] == [2, 1]
+
+
+def test_each_with_joined_collection(db):
+    names = []
+    
+    Author.query().with_joined('books').order_by('id').each(lambda author: names.append(author.name), count=1)
+    
+    assert names == ['Ada', 'Grace']
+
+
+def test_iter_get_streams_selectin_relations(db):
+    authors = list(Author.query().with_('books').order_by('id').iter_get(batch=1))
+    
+    assert [len(author.books) for author in authors] == [2, 1]
+
+
+def test_chunk_walks_the_primary_key(db):
+    chunks = []
+    
+    Author.query().chunk(1, lambda authors: chunks.append([author.name for author in authors]))
+    
+    assert chunks == [['Ada'], ['Grace']]
+
+
+def test_chunk_without_primary_key_keeps_order_and_window(db):
+    chunks = []
+    
+    Book.query().select('title').order_by('title', 'desc').skip(1).take(2).chunk(
+        1, lambda rows: chunks.append(list(rows))
+    )
+    
+    assert chunks == [['Notes'], ['Compilers']]
+
+
+def test_eager_load_callback_rejects_unsupported_methods(db):
+    with pytest.raises(InvalidQueryException):
+        Author.query().with_('books', lambda q: q.where('title', 'Notes')).get()
+
+
+@pytest.mark.parametrize('windowed', [True, False])
+@pytest.mark.parametrize('page, titles', [(1, ['Compilers', 'Notes']), (2, ['Sketch']), (3, [])])
+def test_paginate_total(db, monkeypatch, windowed, page, titles):
+    monkeypatch.setattr(query_builder, '_supports_window_functions', lambda dialect: windowed)
+    
+    result = Book.query().order_by('title').paginate(page=page, per_page=2)
+    
+    assert [book.title for book in result.items] == titles
+    assert result.total == 3
+
+
+@pytest.mark.parametrize('name, version, mariadb, expected', [
+    ('sqlite', (3, 24, 0), False, False),
+    ('sqlite', (3, 25, 0), False, True),
+    ('mysql', (5, 7, 40), False, False),
+    ('mysql', (8, 0, 36), False, True),
+    ('mysql', (10, 1, 48), True, False),
+    ('mysql', (10, 6, 16), True, True),
+    ('postgresql', (9, 6), False, True),
+])
+def test_supports_window_functions(name, version, mariadb, expected):
+    dialect = SimpleNamespace(name=name, server_version_info=version, is_mariadb=mariadb)
+    
+    assert query_builder._supports_window_functions(dialect) is expected
+
+
+@pytest.mark.parametrize('configure', [
+    lambda q: q,
+    lambda q: q.order_by('id', 'desc'),
+])
+def test_chunk_runs_after_load_once_per_row(db, configure):
+    loaded, chunks = [], []
+    query = configure(Book.query()).after_load(lambda book: loaded.append(book.id))
+    
+    query.chunk(1, lambda books: chunks.append([book.id for book in books]))
+    
+    assert sorted(loaded) == [1, 2, 3]
+    assert loaded == [ids[0] for ids in chunks]
+
+
+def test_aggregates_respect_limit_offset_and_group_by(db):
+    assert Book.query().max('id') == 3
+    assert Book.query().order_by('id').take(1).max('id') == 1
+    assert Book.query().order_by('id').skip(1).sum('id') == 5
+    assert Book.query().where('author_id', 1).order_by('id').take(1).min('title') == 'Notes'
+    assert Book.query().select('author_id').group_by('author_id').sum('author_id') == 3
+
+
+def test_aggregate_rejects_a_column_missing_from_a_wrapped_query(db):
+    with pytest.raises(InvalidQueryException):
+        Book.query().select('title').take(2).max('id')
+
+
+def test_soft_deleted_rows_are_filtered_in_sql(db):
+    query = Post.query().order_by('id')
+    
+    assert 'deleted_at IS NULL' in str(query._build_query())
+    assert [post.id for post in query.get()] == [1, 2]
+    assert Post.query().count() == 2
+    assert Post.query().find(3) is None
+
+
+def test_with_trashed_and_only_trashed(db):
+    assert [post.id for post in Post.query().with_trashed().order_by('id').get()] == [1, 2, 3]
+    assert [post.id for post in Post.query().only_trashed().get()] == [3]
+    assert Post.query().only_trashed().count() == 1
+    assert 'deleted_at' not in str(Book.query()._build_query())
+
+
+def test_update_and_delete_apply_the_query_filters(db):
+    assert Book.query().where('author_id', 1).update({'title': 'Draft'}) == 2
+    assert sorted(book.title for book in Book.query().get()) == ['Compilers', 'Draft', 'Draft']
+    
+    assert Book.query().where('title', 'Draft').where('id', '>', 1).delete() == 1
+    assert Book.query().count() == 2
+
+
+def test_update_and_delete_with_where_has(db):
+    db.execute(Author.__table__.insert(), [{'id': 3, 'name': 'Alan'}])
+    
+    assert Author.query().where_has('books').update({'name': 'Writer'}) == 2
+    assert Author.query().where_doesnt_have('books').delete() == 1
+    assert sorted(author.name for author in Author.query().get()) == ['Writer', 'Writer']
+
+
+def test_delete_soft_deletes_unless_forced(db):
+    assert Post.query().where('id', 1).delete() == 1
+    assert [post.id for post in Post.query().get()] == [2]
+    assert Post.query().with_trashed().count() == 3
+    
+    assert Post.query().only_trashed().where('id', 3).force_delete() == 1
+    assert Post.query().only_trashed().restore() == 1
+    assert [post.id for post in Post.query().order_by('id').get()] == [1, 2]
+
+
+def test_range_pair_on_a_column_is_merged_into_between(db):
+    query = Book.query().where('id', '>=', 2).where('title', '!=', 'x').where('id', '<=', 3)
+    
+    assert 'BETWEEN' in str(query._build_query())
+    assert [book.id for book in query.order_by('id').get()] == [2, 3]
+
+
+def test_ambiguous_ranges_are_not_merged(db):
+    query = Book.query().where('id', '>=', 1).where('id', '>=', 2).where('id', '<=', 2)
+    
+    assert 'BETWEEN' not in str(query._build_query())
+    assert [book.id for book in query.get()] == [2]
+
+
+def test_filters_are_emitted_by_selectivity_with_their_own_values(db):
+    query = Book.query().where('title', 'LIKE', '%e%').where('author_id', 1)
+    sql = str(query._build_query())
+    
+    assert sql.index('books.author_id =') < sql.index('books.title LIKE')
+    assert [book.title for book in query.order_by('id').get()] == ['Notes', 'Sketch']
+
+
+def test_where_has_uses_the_mapped_relationship(db):
+    db.execute(Author.__table__.insert(), [{'id': 3, 'name': 'Alan'}])
+    
+    assert [author.name for author in Author.query().where_has('books').order_by('id').get()] == ['Ada', 'Grace']
+    assert [author.name for author in Author.query().where_doesnt_have('books').get()] == ['Alan']
+    assert Author.query().where_has('books').where('name', 'Grace').count() == 1
+    assert 'EXISTS' in str(Author.query().where_has('books')._build_query())
+
+
+def test_where_has_shares_the_cached_statement(db):
+    assert Author.query().where_has('books')._query is Author.query().where_has('books')._query
+
+
+def test_where_has_rejects_an_unknown_relation(db):
+    with pytest.raises(InvalidQueryException):
+        Author.query().where_has('reviews')
+
+
+def test_find_serves_loaded_models_from_the_identity_map(db):
+    statements = []
+    event.listen(db.get_bind(), 'before_cursor_execute', lambda *args: statements.append(args[2]))
+    
+    book = Book.query().find(1)
+    assert Book.query().find(1) is book
+    assert Book.query().find(99) is None
+    assert len(statements) == 2
+
+
+def test_find_falls_back_to_a_query_under_scopes_and_filters(db):
+    assert Page.query().find(1).id == 1
+    assert Page.query().find(2) is None
+    assert Book.query().where('author_id', 2).find(1) is None
+    assert Book.query().where('author_id', 1).find(1).title == 'Notes'
+
+
+def test_find_runs_after_load_callbacks(db):
+    loaded = []
+    
+    Book.query().after_load(lambda book: loaded.append(book.id)).find(2)
+    
+    assert loaded == [2]
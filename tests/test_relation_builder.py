@@ -0,0 +1,48 @@
+from conftest import Author, Book, BookTag, Tag
+from libs.pyloquent.builder.relation_builder import RelationBuilder
+
+
+def tags_of(book):
+    return RelationBuilder(book, Tag, table=BookTag, foreign_key='book_id', related_key='tag_id')
+
+
+def test_pivot_relation_joins_through_the_pivot_table(db):
+    notes = db.get(Book, 1)
+    
+    assert sorted(tag.name for tag in tags_of(notes).get()) == ['history', 'math']
+    assert [tag.name for tag in tags_of(notes).order_by_pivot('position').get()] == ['history', 'math']
+    assert [tag.name for tag in tags_of(notes).where_pivot('position', '>', 1).get()] == ['math']
+    assert [tag.name for tag in tags_of(db.get(Book, 2)).get()] == []
+
+
+def books_of(author):
+    return RelationBuilder(author, Book, foreign_key='author_id')
+
+
+def test_relation_select_is_shared_across_parents(db):
+    ada, grace = db.get(Author, 1), db.get(Author, 2)
+    
+    assert books_of(ada)._build_query() is books_of(grace)._build_query()
+    assert tags_of(db.get(Book, 1))._build_query() is tags_of(db.get(Book, 3))._build_query()
+    assert [book.title for book in books_of(ada).order_by('id').get()] == ['Notes', 'Sketch']
+    assert [book.title for book in books_of(grace).get()] == ['Compilers']
+
+
+def test_as_core_returns_read_only_rows_with_pivot_columns(db):
+    loaded = []
+    rows = tags_of(db.get(Book, 1))\
+        .with_pivot('position')\
+        .order_by_pivot('position')\
+        .after_load(loaded.append)\
+        .as_core()\
+        .get()
+        
+    assert [(row['name'], row['pivot_position']) for row in rows] == [('history', 1), ('math', 2)]
+    assert not isinstance(rows[0], Tag)
+    assert loaded == []
+
+
+def test_as_core_first(db):
+    row = books_of(db.get(Author, 1)).order_by('id').as_core().first()
+    
+    assert (row['id'], row['title']) == (1, 'Notes')